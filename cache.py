@@ -2,6 +2,7 @@
 Thread-safe in-process caches for a single WatchDog run.
 
 PdpCache    — stores PDP verification results keyed by (url, viewport).
+NetworkCache — stores immutable static-asset responses keyed by URL.
 ProgressTracker — formats [N/total] prefixes for log lines.
 """
 
@@ -37,6 +38,45 @@ class PdpCache:
             return len(self._cache)
 
 
+class NetworkCache:
+    """
+    Thread-safe in-memory cache for immutable static assets (hashed JS/CSS bundles).
+    Key: url  →  Value: (status, headers, body)
+
+    Every browser context in a run — desktop, mobile, each worker, each
+    recheck and authenticated pass — downloads the same framework bundles.
+    Only responses marked ``Cache-Control: immutable`` are stored; PDP HTML is
+    never cached because it varies by viewport user-agent and login session.
+    Total body size is capped at *max_bytes*; later assets simply go uncached.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self._cache: dict = {}
+        self._bytes = 0
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def get(self, url: str):
+        """Return cached (status, headers, body) or None if not cached."""
+        with self._lock:
+            return self._cache.get(url)
+
+    def set(self, url: str, status: int, headers: dict, body: bytes) -> bool:
+        """Store a response; returns False if it would exceed the size cap."""
+        with self._lock:
+            if url in self._cache:
+                return True
+            if self._bytes + len(body) > self._max_bytes:
+                return False
+            self._cache[url] = (status, headers, body)
+            self._bytes += len(body)
+            return True
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+
 class ProgressTracker:
     """
     Thread-safe counter that emits [N/total] progress prefixes for log lines.
@@ -5,15 +5,31 @@ Centralises magic strings so validators, reports, and the email service
 all stay in sync when new severity levels or CTA variants are added.
 """
 
+# Severity levels and issue types. Validators, reports and the summary
+# counters all use these objects, so dict keys and comparisons share one
+# string (and its cached hash) instead of per-module literals.
+SEV_CRITICAL = "CRITICAL"
+SEV_HIGH     = "HIGH"
+SEV_MEDIUM   = "MEDIUM"
+SEV_LOW      = "LOW"
+
+TYPE_CTA_BROKEN     = "CTA_BROKEN"
+TYPE_CTA_MISSING    = "CTA_MISSING"
+TYPE_PRICE_MISMATCH = "PRICE_MISMATCH"
+
 # Severity levels in priority order (highest → lowest)
-SEVERITY_ORDER = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+SEVERITY_ORDER = [SEV_CRITICAL, SEV_HIGH, SEV_MEDIUM, SEV_LOW]
+
+# Issue types emitted by the validators, in report display order.
+# Types not listed here are appended alphabetically.
+ISSUE_TYPE_ORDER = (TYPE_CTA_BROKEN, TYPE_CTA_MISSING, TYPE_PRICE_MISMATCH)
 
 # Emoji icons used in email HTML and Markdown reports
 SEVERITY_ICONS = {
-    "CRITICAL": "🔴",
-    "HIGH":     "🟠",
-    "MEDIUM":   "🟡",
-    "LOW":      "🟢",
+    SEV_CRITICAL: "🔴",
+    SEV_HIGH:     "🟠",
+    SEV_MEDIUM:   "🟡",
+    SEV_LOW:      "🟢",
 }
 
 # Button text fragments that indicate a working purchase CTA on a PDP.
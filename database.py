@@ -5,19 +5,125 @@ SQLite persistence layer for WatchDog.
 WAL journal mode allows concurrent reads while a write is in progress,
 which is important when desktop and mobile viewport threads save batches
 at the same time.
+
+After begin(), save_batch leaves its rows in one open transaction and
+commits every FLUSH_EVERY_ROWS rows; flush() commits whatever is pending
+and must run before anything else reads the run (readers on other
+connections only see committed rows). close() flushes too.
+
+One connection is opened per DatabaseManager and shared by every thread;
+a lock serialises access to it. Call close() once the run is finished.
+Code outside this class should go through its methods rather than open
+its own connection; where one is unavoidable, use connect() so it gets the
+same PRAGMAs.
 """
 
 import sqlite3
 import logging
+import threading
+from pathlib import Path
+
+
+# Per-connection settings (journal_mode=WAL is persistent and set once in
+# _init_db). synchronous=NORMAL is crash-safe under WAL and skips the
+# per-commit fsync of the WAL file.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA cache_size=-65536",      # 64 MiB
+    "PRAGMA mmap_size=268435456",    # 256 MiB
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Settings for connect_read_only. The database is deliberately not opened
+# with immutable=1: that skips the WAL file, so rows committed since the
+# last checkpoint would be invisible to the validation scan.
+_READ_ONLY_PRAGMAS = (
+    "PRAGMA query_only=ON",
+    "PRAGMA cache_size=-65536",      # 64 MiB
+    "PRAGMA mmap_size=268435456",    # 256 MiB
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+_INSERT_COURSE_SQL = """
+    INSERT OR IGNORE INTO courses
+        (run_id, base_url, course_name, cta_link, price,
+         pdp_price, cta_status, is_broken, price_mismatch, viewport)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def connect(db_name: str, **kwargs) -> sqlite3.Connection:
+    """Open *db_name* for writing with _CONNECTION_PRAGMAS applied.
+
+    Every read-write connection goes through here so the settings stay
+    uniform. Extra keyword arguments are passed through to sqlite3.connect.
+    """
+    kwargs.setdefault("timeout", 30)
+    conn = sqlite3.connect(db_name, **kwargs)
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def connect_read_only(db_name: str, **kwargs) -> sqlite3.Connection:
+    """Open *db_name* read-only for the validation/report read path.
+
+    mode=ro means the connection can never take a write lock, and
+    query_only=ON rejects any statement that would write; mmap_size lets
+    full-table scans read pages without copying them. Extra keyword
+    arguments are passed through to sqlite3.connect.
+    """
+    uri = Path(db_name).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, **kwargs)
+    for pragma in _READ_ONLY_PRAGMAS:
+        conn.execute(pragma)
+    return conn
 
 
 class DatabaseManager:
+    # Rows held in a deferred transaction before save_batch commits them.
+    FLUSH_EVERY_ROWS = 1000
+
     def __init__(self, db_name="scraped_data.db"):
         self.db_name = db_name
+        self._lock = threading.Lock()
+        self._deferred = False
+        self._pending_rows = 0
+        # isolation_level=None: autocommit, with explicit BEGIN where a
+        # method needs a multi-statement transaction.
+        # timeout=30 ensures threads wait for the write lock instead of crashing
+        self._conn = connect(
+            db_name, isolation_level=None, check_same_thread=False
+        )
         self._init_db()
 
+    def close(self) -> None:
+        """Commit pending rows and close the shared connection."""
+        with self._lock:
+            self._commit()
+            self._conn.close()
+
+    def begin(self) -> None:
+        """Defer save_batch commits until flush() or FLUSH_EVERY_ROWS rows."""
+        with self._lock:
+            self._deferred = True
+
+    def flush(self) -> None:
+        """Commit any rows save_batch has left pending."""
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        # Caller holds self._lock.
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+        self._pending_rows = 0
+
     def _init_db(self):
-        with sqlite3.connect(self.db_name) as conn:
+        with self._lock:
+            conn = self._conn
             conn.execute("PRAGMA journal_mode=WAL")
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS runs (
@@ -43,6 +149,43 @@ class DatabaseManager:
                     timestamp      DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
+            # Covering index for the per-run report aggregate: the GROUP BY in
+            # ReportGenerator._query_db_stats only has to read index pages.
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_courses_report
+                ON courses (run_id, viewport, is_broken, price_mismatch, pdp_price, cta_status)
+            ''')
+            # Dedup key for save_batch's INSERT OR IGNORE: the same card can
+            # only be recorded once per run, URL and viewport, so a card shown
+            # under two tabs/pills is stored once. Databases created before
+            # the index may hold such duplicates; they are removed once
+            # (keeping the first row) so the index exists everywhere.
+            has_dedup_index = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='index' AND name='ux_courses_dedup'"
+            ).fetchone()
+            if not has_dedup_index:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    removed = conn.execute('''
+                        DELETE FROM courses
+                        WHERE id NOT IN (
+                            SELECT MIN(id) FROM courses
+                            GROUP BY run_id, viewport, base_url, course_name, cta_link
+                        )
+                    ''').rowcount
+                    conn.execute('''
+                        CREATE UNIQUE INDEX ux_courses_dedup
+                        ON courses (run_id, viewport, base_url, course_name, cta_link)
+                    ''')
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                if removed:
+                    logging.warning(
+                        f"Removed {removed} duplicate course row(s) while "
+                        f"creating ux_courses_dedup."
+                    )
             # Migration guards for existing databases
             for col_def in [
                 "ALTER TABLE runs ADD COLUMN mode TEXT NOT NULL DEFAULT 'guest'",
@@ -50,67 +193,115 @@ class DatabaseManager:
             ]:
                 try:
                     conn.execute(col_def)
-                    conn.commit()
                 except sqlite3.OperationalError:
                     pass  # column already exists
 
     def create_run(self, mode: str = "guest", profile: str | None = None) -> int:
         """Insert a new row into the runs table and return its run_id."""
-        with sqlite3.connect(self.db_name, timeout=30) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+        with self._lock:
+            cursor = self._conn.execute(
                 "INSERT INTO runs (mode, profile) VALUES (?, ?)",
                 (mode, profile),
             )
-            conn.commit()
             run_id = cursor.lastrowid
             logging.info(f"Run #{run_id} started (mode={mode}, profile={profile}).")
             return run_id
 
     def save_batch(self, courses, run_id: int):
-        """Persist a batch of scraped courses tagged with *run_id*."""
-        # timeout=30 ensures threads wait for the write lock instead of crashing
-        with sqlite3.connect(self.db_name, timeout=30) as conn:
-            cursor = conn.cursor()
-            new_items = 0
-            for item in courses:
-                viewport = item.get("viewport", "desktop")
-                cursor.execute(
-                    """
-                    INSERT INTO courses
-                        (run_id, base_url, course_name, cta_link, price,
-                         pdp_price, cta_status, is_broken, price_mismatch, viewport)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        run_id,
-                        item["base_url"],
-                        item["course_name"],
-                        item["cta_link"],
-                        item["price"],
-                        item.get("pdp_price", "N/A"),
-                        item.get("cta_status", "N/A"),
-                        item.get("is_broken", 0),
-                        item.get("price_mismatch", 0),
-                        viewport,
-                    ),
-                )
-                new_items += 1
-            conn.commit()
+        """Persist a batch of scraped courses tagged with *run_id*.
+
+        Rows already recorded for the same run/viewport/URL/course/link are
+        skipped by the ux_courses_dedup index. The batch is committed at
+        once unless begin() has been called.
+        """
+        get = dict.get
+        rows = [
+            (
+                run_id,
+                item["base_url"],
+                item["course_name"],
+                item["cta_link"],
+                item["price"],
+                get(item, "pdp_price", "N/A"),
+                get(item, "cta_status", "N/A"),
+                get(item, "is_broken", 0),
+                get(item, "price_mismatch", 0),
+                get(item, "viewport", "desktop"),
+            )
+            for item in courses
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._conn
+            # Take the write lock up front so the whole batch shares one
+            # commit and never has to upgrade a read lock mid-batch.
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            # The savepoint lets a failing batch roll back on its own without
+            # discarding rows earlier batches left pending.
+            conn.execute("SAVEPOINT save_batch")
+            try:
+                cursor = conn.executemany(_INSERT_COURSE_SQL, rows)
+                conn.execute("RELEASE save_batch")
+            except Exception:
+                conn.execute("ROLLBACK TO save_batch")
+                conn.execute("RELEASE save_batch")
+                if not self._deferred:
+                    self._commit()
+                raise
+            # rowcount sums the rows each INSERT actually wrote, so ignored
+            # duplicates are not counted.
+            new_items = cursor.rowcount
+            self._pending_rows += new_items
+            if not self._deferred or self._pending_rows >= self.FLUSH_EVERY_ROWS:
+                self._commit()
             if new_items > 0:
                 logging.debug(
-                    f"[{viewport}] Saved {new_items} courses (run #{run_id})."
+                    f"[{rows[0][9]}] Saved {new_items} courses (run #{run_id})."
                 )
 
+    def delete_url_rows(self, run_id: int, viewport: str, urls) -> int:
+        """Delete this run's rows for *urls* in *viewport*; return the row count."""
+        urls = list(urls)
+        if not urls:
+            return 0
+        placeholders = ",".join(["?"] * len(urls))
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM courses "
+                f"WHERE run_id=? AND viewport=? AND base_url IN ({placeholders})",
+                [run_id, viewport] + urls,
+            )
+            return cursor.rowcount
+
+    def get_seen_courses(self, base_url: str, viewport: str, run_id: int) -> dict:
+        """Return the latest result stored for *base_url* / *viewport* by a run
+        other than *run_id*.
+
+        Keys are (course_name, cta_link, price), so a card whose listed price
+        changed is verified again; values are (pdp_price, cta_status,
+        is_broken, price_mismatch), ready to be copied forward into *run_id*.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT course_name, cta_link, price, pdp_price, cta_status, "
+                "is_broken, price_mismatch FROM courses "
+                "WHERE base_url=? AND viewport=? AND run_id IS NOT ? "
+                "ORDER BY id",
+                (base_url, viewport, run_id),
+            ).fetchall()
+        # Ordered by id, so the most recent row for a card wins.
+        return {row[:3]: row[3:] for row in rows}
+
     def get_url_stats(self, base_url: str, run_id: int, viewport: str) -> dict:
         """Return total card count + issue count for a URL in this run/viewport.
 
         Issues = broken links + price mismatches + missing CTA buttons.
         All three flags must agree with the validation report.
         """
-        with sqlite3.connect(self.db_name, timeout=30) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+        with self._lock:
+            cursor = self._conn.execute(
                 """
                 SELECT
                     COUNT(*),
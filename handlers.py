@@ -23,6 +23,13 @@ WATCHDOG_HOME_API_RE          Regex to await a network response before home-page
 WATCHDOG_PLP_API_RE           Regex to await a network response before PLP scrape.
 WATCHDOG_STREAM_API_RE        Regex to await a network response before stream-page scrape.
 WATCHDOG_NAV_JITTER_MS        Random pre-request delay ceiling in ms (default 0 = disabled).
+WATCHDOG_SETTLE_MS            Max wait for the listing's cards to change after a tab/pill
+                              click (default 2000 ms).
+WATCHDOG_BLOCK_RESOURCES      Abort image/font/media and analytics requests (default true).
+WATCHDOG_BLOCK_CSS            Also abort stylesheets (default false; can hide CTA text).
+WATCHDOG_INCREMENTAL          Skip the PDP check for cards (same name, link and price) already
+                              stored for the URL/viewport by an earlier run and copy that
+                              result into this run; re-checks ignore it (default false).
 """
 
 import os
@@ -34,9 +41,9 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 
 from database import DatabaseManager
-from cache import PdpCache
+from cache import NetworkCache, PdpCache
 from constants import CTA_KEYWORDS
-from utils import clean_price as _shared_clean_price
+from utils import clean_price as _shared_clean_price, price_value
 
 
 # ---------------------------------------------------------------------------
@@ -67,6 +74,17 @@ def _env_str(name: str, default: str | None = None) -> str | None:
     return val if val not in (None, "") else default
 
 
+def _env_regex(name: str) -> re.Pattern | None:
+    val = _env_str(name)
+    if val is None:
+        return None
+    try:
+        return re.compile(val)
+    except re.error:
+        logging.warning(f"Invalid regex for {name}={val!r}; ignoring it.")
+        return None
+
+
 # ---------------------------------------------------------------------------
 # Runtime configuration (read once at import time from environment)
 # ---------------------------------------------------------------------------
@@ -78,18 +96,222 @@ WATCHDOG_MAX_WORKERS      = _env_int("WATCHDOG_MAX_WORKERS", 4)
 WATCHDOG_FAIL_ON_EMPTY    = _env_bool("WATCHDOG_FAIL_ON_EMPTY", False)
 WATCHDOG_ARTIFACT_DIR     = _env_str("WATCHDOG_ARTIFACT_DIR", "artifacts/watchdog")
 WATCHDOG_NAV_JITTER_MS    = _env_int("WATCHDOG_NAV_JITTER_MS", 0)
-WATCHDOG_HOME_API_RE      = _env_str("WATCHDOG_HOME_API_RE")
-WATCHDOG_PLP_API_RE       = _env_str("WATCHDOG_PLP_API_RE")
-WATCHDOG_STREAM_API_RE    = _env_str("WATCHDOG_STREAM_API_RE")
+WATCHDOG_SETTLE_MS        = _env_int("WATCHDOG_SETTLE_MS", 2000)
+WATCHDOG_HOME_API_RE      = _env_regex("WATCHDOG_HOME_API_RE")
+WATCHDOG_PLP_API_RE       = _env_regex("WATCHDOG_PLP_API_RE")
+WATCHDOG_STREAM_API_RE    = _env_regex("WATCHDOG_STREAM_API_RE")
+WATCHDOG_BLOCK_RESOURCES  = _env_bool("WATCHDOG_BLOCK_RESOURCES", True)
+WATCHDOG_BLOCK_CSS        = _env_bool("WATCHDOG_BLOCK_CSS", False)
+WATCHDOG_INCREMENTAL      = _env_bool("WATCHDOG_INCREMENTAL", False)
+
+
+# ---------------------------------------------------------------------------
+# Request routing — block what the scrape never reads, replay cached assets
+# ---------------------------------------------------------------------------
+
+_BLOCKED_RESOURCE_TYPES = frozenset(
+    ("image", "font", "media") + (("stylesheet",) if WATCHDOG_BLOCK_CSS else ())
+)
+_BLOCKED_HOST_RE = re.compile(
+    r"google-analytics\.com|googletagmanager\.com|doubleclick\.net"
+    r"|connect\.facebook\.net|clarity\.ms|hotjar\.com"
+)
+
+
+_CACHEABLE_RESOURCE_TYPES = frozenset(("script", "stylesheet"))
+
+
+def _route_filter(route, asset_cache: NetworkCache | None = None) -> None:
+    request = route.request
+    if WATCHDOG_BLOCK_RESOURCES and (
+        request.resource_type in _BLOCKED_RESOURCE_TYPES
+        or _BLOCKED_HOST_RE.search(request.url)
+    ):
+        route.abort()
+        return
+
+    if (
+        asset_cache is None
+        or request.method != "GET"
+        or request.resource_type not in _CACHEABLE_RESOURCE_TYPES
+    ):
+        route.continue_()
+        return
+
+    cached = asset_cache.get(request.url)
+    if cached is not None:
+        status, headers, body = cached
+        route.fulfill(status=status, headers=headers, body=body)
+        return
+
+    response = route.fetch()
+    body = response.body()
+    headers = response.headers
+    if response.ok and "immutable" in headers.get("cache-control", ""):
+        # body() is already decoded, so replayed responses must not claim an
+        # encoding or the original compressed length.
+        replay_headers = {
+            k: v for k, v in headers.items()
+            if k not in ("content-encoding", "content-length")
+        }
+        asset_cache.set(request.url, response.status, replay_headers, body)
+    route.fulfill(response=response, body=body)
+
+
+def install_request_routing(target, asset_cache: NetworkCache | None = None) -> None:
+    """Route requests of *target* (a page, or a context to cover every page
+    it opens): abort heavy/third-party ones (see WATCHDOG_BLOCK_*) and serve
+    immutable JS/CSS from *asset_cache*."""
+    if WATCHDOG_BLOCK_RESOURCES or asset_cache is not None:
+        target.route("**/*", lambda route: _route_filter(route, asset_cache))
+
+
+# ---------------------------------------------------------------------------
+# Tab / filter-pill matchers (compiled once at import time)
+# ---------------------------------------------------------------------------
+
+_HOME_TAB_RE = re.compile(r"^(JEE|NEET|Classes 6-10)$")
+_PLP_PILL_RE = re.compile(r"^(Live|Recorded|Online Test Series|Offline Test Series)$")
+_STREAM_TAB_RE = re.compile(r"^Class \d+\+?$")
+
+
+# ---------------------------------------------------------------------------
+# In-page PDP scans (composed into one round-trip by _PDP_SCAN_JS)
+# ---------------------------------------------------------------------------
+
+# Text of the first element under a card matching one of the selectors, in
+# order; used by safe_get_text so a card costs one round-trip, not 2 per selector.
+_FIRST_TEXT_JS = """
+(root, selectors) => {
+    for (const sel of selectors) {
+        const el = root.querySelector(sel);
+        if (!el) continue;
+        const text = (el.innerText || "").trim().replace(/\\n/g, " ");
+        if (text) return text;
+    }
+    return "N/A";
+}
+"""
+
+# First usable href on a card (the card itself if it is an <a>, then its
+# descendant links), skipping "#" anchors and javascript: links.
+_CARD_HREF_JS = """
+(root) => {
+    const links = root.matches("a") ? [root] : [];
+    links.push(...root.querySelectorAll("a"));
+    for (const a of links) {
+        const href = a.getAttribute("href");
+        if (href && !href.startsWith("#") && !href.includes("javascript")) return href;
+    }
+    return null;
+}
+"""
+
+# {name, price, href} for every card a locator matches, in one evaluate_all;
+# name/price use the safe_get_text scan, href the extract_cta_link one.
+_CARD_RECORDS_JS = f"""
+(cards, [nameSelectors, priceSelectors]) => {{
+    const firstText = {_FIRST_TEXT_JS.strip()};
+    const firstHref = {_CARD_HREF_JS.strip()};
+    return cards.map(card => ({{
+        name: firstText(card, nameSelectors),
+        price: firstText(card, priceSelectors),
+        href: firstHref(card),
+    }}));
+}}
+"""
+
+# Fingerprint of the listing's cards (count plus first and last card text),
+# taken before a tab/pill click so _click_tab can wait for it to change.
+_CARD_SIGNATURE_JS = """
+(selector) => {
+    const els = document.querySelectorAll(selector);
+    const n = els.length;
+    return n ? `${n}|${els[0].textContent}|${els[n - 1].textContent}` : "0";
+}
+"""
+
+# Truthy once the fingerprint differs from the one taken before the click.
+_CARDS_CHANGED_JS = f"""
+([selector, before]) => ({_CARD_SIGNATURE_JS.strip()})(selector) !== before
+"""
+
+# First short "₹" text on the PDP among *tags*, in the order given.
+_PDP_PRICE_JS = """
+(tags) => {
+    for (const tag of tags) {
+        for (const el of document.querySelectorAll(tag)) {
+            const text = (el.innerText || "").trim();
+            if (text.includes("₹") && text.length < 25) return text;
+        }
+    }
+    return null;
+}
+"""
+
+# Display text of the first purchase CTA matching one of the keywords passed
+# in (exact match, or substring of a label shorter than 40 chars). The
+# keywords are folded into one regex so each label is tested once.
+_PDP_CTA_JS = """
+(keywords) => {
+    const exact = new Set(keywords);
+    const anyKeyword = new RegExp(
+        keywords.map(kw => kw.replace(/[.*+?^${}()|[\\]\\\\]/g, "\\\\$&")).join("|")
+    );
+    const els = document.querySelectorAll(
+        'button, a, input[type="button"], input[type="submit"]'
+    );
+    for (const el of els) {
+        const inner = (el.innerText || "").trim();
+        const content = (el.textContent || "").trim();
+        const text = (
+            inner || content
+            || (el.getAttribute("aria-label") || "").trim()
+            || (el.getAttribute("value") || "").trim()
+        ).toLowerCase();
+        if (text && (exact.has(text) || (text.length < 40 && anyKeyword.test(text)))) {
+            return inner || content || text;
+        }
+    }
+    return null;
+}
+"""
+
+# Both PDP scans in one call, after scrolling to the bottom so lazy/sticky CTA
+# bars render. With requireBoth (wait_for_function polling) it returns null
+# until the CTA and the headline h2 price are both present: an EMI or
+# strikethrough price in a span can render before the h2 one and must not win.
+# Otherwise it returns [price, cta] as found, preferring h2 > span > p > div.
+_PDP_SCAN_JS = f"""
+([keywords, requireBoth]) => {{
+    const findPrice = {_PDP_PRICE_JS.strip()};
+    const findCta = {_PDP_CTA_JS.strip()};
+    window.scrollTo(0, document.body.scrollHeight);
+    const cta = findCta(keywords);
+    if (requireBoth) {{
+        const price = findPrice(["h2"]);
+        return price && cta ? [price, cta] : null;
+    }}
+    return [findPrice(["h2", "span", "p", "div"]), cta];
+}}
+"""
 
 
 # ---------------------------------------------------------------------------
 # Abstract base handler
 # ---------------------------------------------------------------------------
 
+def _absolute_link(href: str) -> str:
+    """Resolve a site-relative card href against https://allen.in."""
+    return f"https://allen.in{href}" if href.startswith("/") else href
+
+
 class BasePageHandler(ABC):
     """Abstract base class for all page-specific scraping logic."""
 
+    # CSS selector for the listing's course cards; _click_tab watches it.
+    CARD_SELECTOR = "li"
+
     def __init__(
         self,
         page,
@@ -97,12 +319,22 @@ class BasePageHandler(ABC):
         viewport: str = "desktop",
         run_id: int = None,
         pdp_cache: PdpCache = None,
+        pdp_page=None,
+        incremental: bool = True,
     ):
         self.page = page
+        # Second page in the same context for verify_pdp, so PDP visits never
+        # disturb the listing page (or its selected tab/pill). A page the
+        # handler opens itself is closed by close(); a passed-in one is not.
+        self._owns_pdp_page = pdp_page is None
+        self.pdp_page = page.context.new_page() if pdp_page is None else pdp_page
         self.db = db_manager
         self.viewport = viewport       # 'desktop' | 'mobile'
         self.run_id = run_id
         self.pdp_cache = pdp_cache     # shared, thread-safe PDP result cache
+        # False for re-check passes, which must re-verify every card even
+        # when WATCHDOG_INCREMENTAL is on.
+        self.incremental = incremental
         self.processed_keys = set()
         self._console_logs: list[str] = []
         try:
@@ -110,6 +342,15 @@ class BasePageHandler(ABC):
         except Exception as e:
             logging.debug(f"Could not attach console listener: {e}")
 
+    def close(self):
+        """Close the PDP page if this handler opened it."""
+        if self._owns_pdp_page:
+            self._owns_pdp_page = False
+            try:
+                self.pdp_page.close()
+            except Exception as e:
+                logging.debug(f"Could not close PDP page: {e}")
+
     def _on_console(self, msg):
         try:
             self._console_logs.append(f"{msg.type}: {msg.text}")
@@ -150,26 +391,22 @@ class BasePageHandler(ABC):
         except Exception as e:
             logging.debug(f"Could not write log artifact: {e}")
 
-    def _wait_for_api(self, api_re: str | None, timeout_ms: int) -> bool:
-        if not api_re:
-            return False
-        try:
-            pattern = re.compile(api_re)
-        except re.error:
-            logging.warning(f"Invalid WATCHDOG API regex: {api_re!r}")
+    def _wait_for_api(self, api_re: re.Pattern | None, timeout_ms: int) -> bool:
+        if api_re is None:
             return False
+        search = api_re.search
         try:
             self.page.wait_for_response(
-                lambda resp: pattern.search(resp.url), timeout=timeout_ms
+                lambda resp: search(resp.url), timeout=timeout_ms
             )
             return True
         except Exception:
             return False
 
-    def _is_cloudfront_403(self) -> bool:
+    def _is_cloudfront_403(self, page=None) -> bool:
         """Returns True if the current page is a CloudFront 403 block page."""
         try:
-            content = self.page.content()
+            content = (self.page if page is None else page).content()
             return (
                 "The request could not be satisfied" in content
                 and "cloudfront" in content.lower()
@@ -177,21 +414,26 @@ class BasePageHandler(ABC):
         except Exception:
             return False
 
-    def _navigate(self, url: str, wait_until: str = "domcontentloaded", timeout: int = 30000) -> bool:
-        """Navigate to url with 403-aware exponential backoff retry.
+    def _navigate(
+        self, url: str, wait_until: str = "domcontentloaded", timeout: int = 30000, page=None
+    ) -> bool:
+        """Navigate *page* (default self.page) to url with 403-aware exponential
+        backoff retry.
 
         Detects both HTTP-level 403 responses and CloudFront HTML error pages.
         Returns True on success, False if all retries are exhausted.
         """
+        if page is None:
+            page = self.page
         base_backoff = WATCHDOG_RETRY_BACKOFF_MS / 1000.0
         for attempt in range(WATCHDOG_RETRIES + 1):
             response = None
             try:
-                response = self.page.goto(url, wait_until=wait_until, timeout=timeout)
+                response = page.goto(url, wait_until=wait_until, timeout=timeout)
             except Exception as e:
                 logging.warning(f"  _navigate: goto exception on {url}: {e}")
 
-            is_403 = (response is not None and response.status == 403) or self._is_cloudfront_403()
+            is_403 = (response is not None and response.status == 403) or self._is_cloudfront_403(page)
 
             if not is_403:
                 return True
@@ -213,10 +455,10 @@ class BasePageHandler(ABC):
         return False
 
     def wait_for_cards(
-        self, selector: str, url: str, handler_name: str, api_re: str | None = None
+        self, selector: str, url: str, handler_name: str, api_re: re.Pattern | None = None
     ) -> bool:
         for attempt in range(WATCHDOG_RETRIES + 1):
-            if api_re:
+            if api_re is not None:
                 self._wait_for_api(api_re, WATCHDOG_WAIT_MS)
             try:
                 self.page.wait_for_selector(selector, timeout=WATCHDOG_WAIT_MS)
@@ -241,6 +483,56 @@ class BasePageHandler(ABC):
                     return False
         self.processed_keys = set()
 
+    def _click_tab(self, tab_el, timeout_ms: int | None = None) -> None:
+        """Click a tab/pill and wait, at most *timeout_ms* (WATCHDOG_SETTLE_MS),
+        for the cards matching CARD_SELECTOR to re-render.
+
+        networkidle can't be used here: it fires once per document and is not
+        re-armed by in-page clicks. If the cards never change (the tab was
+        already active) the full cap is spent, as the old fixed sleep did.
+        """
+        timeout = WATCHDOG_SETTLE_MS if timeout_ms is None else timeout_ms
+        page = self.page
+        try:
+            before = page.evaluate(_CARD_SIGNATURE_JS, self.CARD_SELECTOR)
+        except Exception:
+            before = None
+        tab_el.evaluate("el => el.click()")
+        if before is None:
+            page.wait_for_timeout(timeout)
+            return
+        try:
+            page.wait_for_function(
+                _CARDS_CHANGED_JS,
+                arg=[self.CARD_SELECTOR, before],
+                timeout=timeout,
+                polling=100,
+            )
+        except Exception:
+            pass  # unchanged within the cap — carry on with what rendered
+
+    def _already_scraped(self, url: str) -> dict:
+        """Earlier runs' results for cards on *url*, keyed by (course_name,
+        cta_link, price), when WATCHDOG_INCREMENTAL is on; see _verify_cards."""
+        if not (WATCHDOG_INCREMENTAL and self.incremental):
+            return {}
+        return self.db.get_seen_courses(url, self.viewport, self.run_id)
+
+    def discover_tabs(self, selector: str, pattern: re.Pattern) -> list:
+        """Return unique (locator, text) pairs for tabs/pills matching *pattern*.
+
+        The text filter runs in the browser and all labels come back in one
+        all_inner_texts() call; each locator is pinned with nth().
+        """
+        loc = self.page.locator(selector).filter(has_text=pattern)
+        tabs, seen = [], set()
+        for i, txt in enumerate(loc.all_inner_texts()):
+            txt = txt.strip()
+            if txt and txt not in seen:
+                seen.add(txt)
+                tabs.append((loc.nth(i), txt))
+        return tabs
+
     def clean_price(self, price_str):
         """Extracts numeric value from price strings (e.g., '₹ 93,500' -> '93500')."""
         return _shared_clean_price(price_str)
@@ -257,22 +549,61 @@ class BasePageHandler(ABC):
 
     def safe_get_text(self, container, selectors):
         """Try multiple selectors and return the first non-empty text found."""
-        for sel in selectors:
-            loc = container.locator(sel)
-            if loc.count() > 0:
-                text = loc.first.inner_text().strip().replace("\n", " ")
-                if text:
-                    return text
-        return "N/A"
+        return container.evaluate(_FIRST_TEXT_JS, selectors)
+
+    def card_records(self, cards, name_selectors, price_selectors):
+        """Return a {name, price, href} dict per card matched by the *cards*
+        locator, read in one round-trip. Missing text is "N/A", a missing
+        href None."""
+        return cards.evaluate_all(_CARD_RECORDS_JS, [name_selectors, price_selectors])
+
+    def _card_link(self, record, card, tab_el, tab_text):
+        """CTA URL for a card record; clicks through only if it had no href."""
+        if record["href"]:
+            return _absolute_link(record["href"])
+        return self.extract_cta_link(card, tab_el, tab_text)
+
+    def _verify_cards(self, pending, url, seen=None):
+        """Run verify_pdp for each (name, card_price, link) collected from the
+        listing and return the rows for save_batch.
+
+        Cards are verified only after the whole tab has been read. A card
+        whose (name, link, card_price) is in *seen* skips the PDP visit and has
+        that earlier result copied forward, so this run's report still lists it.
+        """
+        viewport = self.viewport
+        seen = seen or {}
+        batch = []
+        for name, card_price, link in pending:
+            earlier = seen.get((name, link, card_price))
+            if earlier is not None:
+                logging.debug(f"  [SKIP-SEEN] {name}")
+                pdp_price, cta_status, is_broken, mismatch = earlier
+            else:
+                pdp_price, cta_status, is_broken, mismatch = self.verify_pdp(
+                    link, url, card_price
+                )
+            if is_broken:
+                logging.warning(f"  ⚠️  Broken link for '{name}': {link}")
+            batch.append({
+                "base_url":       url,
+                "course_name":    name,
+                "cta_link":       link,
+                "price":          card_price,
+                "pdp_price":      pdp_price,
+                "cta_status":     cta_status,
+                "is_broken":      is_broken,
+                "price_mismatch": mismatch,
+                "viewport":       viewport,
+            })
+        return batch
 
     def extract_cta_link(self, card, tab_el=None, tab_text="Default"):
         """Return a CTA URL: checks hrefs first, then click-and-capture."""
         # 1. Look for direct links
-        links = card.locator("xpath=self::a | .//a")
-        for i in range(links.count()):
-            href = links.nth(i).get_attribute("href")
-            if href and not href.startswith("#") and "javascript" not in href:
-                return f"https://allen.in{href}" if href.startswith("/") else href
+        href = card.evaluate(_CARD_HREF_JS)
+        if href:
+            return _absolute_link(href)
 
         # 2. Click and Capture
         cta = card.locator("button")
@@ -282,30 +613,36 @@ class BasePageHandler(ABC):
                 cta.first.scroll_into_view_if_needed()
                 cta.first.evaluate("el => el.click()")
 
-                start = time.time()
-                while time.time() - start < 8:
-                    if self.page.evaluate("window.location.href") != current_url:
-                        break
-                    time.sleep(0.5)
+                try:
+                    # Event-driven: resolves on the navigation (or SPA
+                    # pushState) itself; "commit" = don't wait for page load.
+                    self.page.wait_for_url(
+                        lambda u: u != current_url, wait_until="commit", timeout=8000
+                    )
+                except Exception:
+                    pass  # no navigation within 8s; fall through with current URL
 
-                final_link = self.page.evaluate("window.location.href")
+                final_link = self.page.url
 
                 if final_link != current_url:
                     self.page.go_back(wait_until="domcontentloaded")
                     if tab_el:
-                        tab_el.evaluate("el => el.click()")
-                        time.sleep(2)
+                        self._click_tab(tab_el)
                 return final_link
             except Exception as e:
                 logging.warning(f"Failed to capture link via click: {e}")
         return self.page.url
 
-    def verify_pdp(self, pdp_url, original_url, card_price=None):
-        """Navigate to the PDP and return (pdp_price, cta_status, is_broken, price_mismatch).
+    def verify_pdp(self, pdp_url, original_url, card_price=None, page=None):
+        """Navigate *page* (default self.pdp_page) to the PDP
+        and return (pdp_price, cta_status, is_broken, price_mismatch).
 
         Results are cached per (pdp_url, viewport) so the same PDP is never
-        visited more than once per run.
+        visited more than once per run. The listing is not restored here;
+        see _verify_cards.
         """
+        if page is None:
+            page = self.pdp_page
         if not pdp_url or pdp_url == original_url:
             return "N/A", "N/A", 1, 0
 
@@ -317,79 +654,38 @@ class BasePageHandler(ABC):
 
         try:
             logging.debug(f"  → PDP: {pdp_url}")
-            if not self._navigate(pdp_url, timeout=30000):
+            if not self._navigate(pdp_url, timeout=30000, page=page):
                 return "Blocked", "Blocked", 1, 0
-            time.sleep(2)
-
-            is_broken = 1 if self.page.url.strip("/") == original_url.strip("/") else 0
-
-            # 2. Look for Price (₹ symbol)
-            pdp_price = "Not Found"
-            price_locators = [
-                'h2:has-text("₹")',
-                'span:has-text("₹")',
-                'p:has-text("₹")',
-                'div:has-text("₹")',
-            ]
-            for sel in price_locators:
-                loc = self.page.locator(sel)
-                for i in range(loc.count()):
-                    text = loc.nth(i).inner_text().strip()
-                    if "₹" in text and len(text) < 25:
-                        pdp_price = text
-                        break
-                if pdp_price != "Not Found":
-                    break
+
+            is_broken = 1 if page.url.strip("/") == original_url.strip("/") else 0
+
+            # 2. Price (₹ symbol) and CTA in one in-page scan.
+            # Mobile PDPs require a reload to render sticky bottom bars correctly.
+            if self.viewport == "mobile":
+                page.reload(wait_until="load")
+
+            # Returns as soon as the CTA and the h2 price have rendered; on
+            # timeout, take whatever is there (price by h2 > span > p > div).
+            try:
+                pdp_price, cta_text = page.wait_for_function(
+                    _PDP_SCAN_JS, arg=[CTA_KEYWORDS, True], timeout=3000, polling=100
+                ).json_value()
+            except Exception:
+                pdp_price, cta_text = page.evaluate(_PDP_SCAN_JS, [CTA_KEYWORDS, False])
+            pdp_price = pdp_price or "Not Found"
+            cta_status = f"Found ({cta_text})" if cta_text else "Not Found"
 
             # 3. Price mismatch check
             price_mismatch = 0
             if card_price and pdp_price != "Not Found":
-                c_price = self.clean_price(card_price)
-                p_price = self.clean_price(pdp_price)
-                if c_price and p_price and c_price != p_price:
+                c_price = price_value(card_price)
+                p_price = price_value(pdp_price)
+                if c_price is not None and p_price is not None and c_price != p_price:
                     price_mismatch = 1
                     logging.warning(
                         f"     [FLAG] Price mismatch: Card={card_price} vs PDP={pdp_price}"
                     )
 
-            # 4. Look for CTA
-            # Mobile PDPs require a reload to render sticky bottom bars correctly.
-            if self.viewport == "mobile":
-                self.page.reload(wait_until="domcontentloaded")
-                time.sleep(1)
-
-            self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            self.page.wait_for_timeout(1000)
-
-            cta_status = "Not Found"
-            buttons = self.page.locator(
-                'button, a, input[type="button"], input[type="submit"]'
-            ).all()
-            for btn in buttons:
-                try:
-                    text = btn.inner_text().strip().lower()
-                    if not text:
-                        text = (btn.text_content() or "").strip().lower()
-                    if not text:
-                        text = (btn.get_attribute("aria-label") or "").strip().lower()
-                    if not text:
-                        text = (btn.get_attribute("value") or "").strip().lower()
-
-                    if text and any(
-                        kw == text or (kw in text and len(text) < 40)
-                        for kw in CTA_KEYWORDS
-                    ):
-                        display = (
-                            btn.inner_text().strip()
-                            or btn.text_content().strip()
-                            or text
-                        )
-                        cta_status = f"Found ({display})"
-                        break
-                except Exception:
-                    continue
-
-            self._navigate(original_url)
             result = (pdp_price, cta_status, is_broken, price_mismatch)
 
             if self.pdp_cache is not None:
@@ -399,10 +695,6 @@ class BasePageHandler(ABC):
 
         except Exception as e:
             logging.warning(f"     PDP verification failed: {e}")
-            try:
-                self._navigate(original_url)
-            except Exception as nav_err:
-                logging.debug(f"Could not navigate back to {original_url}: {nav_err}")
             return "Error", "Error", 1, 0
 
 
@@ -411,6 +703,8 @@ class BasePageHandler(ABC):
 # ---------------------------------------------------------------------------
 
 class HomepageHandler(BasePageHandler):
+    CARD_SELECTOR = "div.rounded-normal.flex.flex-col"
+
     @staticmethod
     def can_handle(url):
         return url.strip("/") == "https://allen.in"
@@ -422,28 +716,30 @@ class HomepageHandler(BasePageHandler):
         if not self._navigate(url):
             return
         self.wait_for_cards(
-            "div.rounded-normal.flex.flex-col",
+            self.CARD_SELECTOR,
             url,
             "HomepageHandler",
             api_re=WATCHDOG_HOME_API_RE,
         )
-        time.sleep(2)
 
-        tab_loc = self.page.locator('div[data-testid*="TAB_ITEM"]')
-        tabs = []
-        for t in tab_loc.all():
-            txt = t.inner_text().strip()
-            if txt in ["JEE", "NEET", "Classes 6-10"]:
-                tabs.append((t, txt))
+        tabs = self.discover_tabs('div[data-testid*="TAB_ITEM"]', _HOME_TAB_RE)
+
+        # Per-card loop locals
+        processed = self.processed_keys
+        already_scraped = self._already_scraped(url)
 
         for tab_el, tab_name in (tabs if tabs else [(None, "Main")]):
             logging.debug(f"  Tab: {tab_name}")
             if tab_el:
-                tab_el.evaluate("el => el.click()")
-                time.sleep(2)
+                self._click_tab(tab_el)
 
-            cards = self.page.locator("div.rounded-normal.flex.flex-col")
-            if cards.count() == 0:
+            cards = self.page.locator(self.CARD_SELECTOR)
+            records = self.card_records(
+                cards,
+                ["h2", "p.font-semibold"],
+                ['[class*="price"]', '[class*="fee"]', "h3"],
+            )
+            if not records:
                 logging.warning(
                     f"HomepageHandler: Zero cards on tab '{tab_name}' at {url}"
                 )
@@ -451,52 +747,32 @@ class HomepageHandler(BasePageHandler):
                 if WATCHDOG_FAIL_ON_EMPTY:
                     raise RuntimeError(f"HomepageHandler: No cards found on {url}")
                 continue
-            scraped_batch = []
-
-            for i in range(cards.count()):
-                if tab_el:
-                    tab_el.evaluate("el => el.click()")
-                    time.sleep(1)
+            pending = []
 
-                card = cards.nth(i)
-                name = self.safe_get_text(card, ["h2", "p.font-semibold"])
+            for i, record in enumerate(records):
+                name = record["name"]
 
-                if name == "N/A" or f"{tab_name}_{name}" in self.processed_keys:
+                key = (tab_name, name)
+                if name == "N/A" or key in processed:
                     continue
-                self.processed_keys.add(f"{tab_name}_{name}")
+                processed.add(key)
 
                 if "DLP" in name:
                     logging.debug(f"  [SKIP-DLP] {name}")
                     continue
 
                 logging.debug(f"    Card: {name}")
-                card_price = self.safe_get_text(
-                    card, ['[class*="price"]', '[class*="fee"]', "h3"]
-                )
-                link = self.extract_cta_link(card, tab_el, tab_name)
-                pdp_price, cta_status, is_broken, mismatch = self.verify_pdp(
-                    link, url, card_price
-                )
-
-                if is_broken:
-                    logging.warning(f"  ⚠️  Broken link for '{name}': {link}")
+                card_price = record["price"]
+                pending.append((name, card_price, self._card_link(record, cards.nth(i), tab_el, tab_name)))
 
-                scraped_batch.append({
-                    "base_url":       url,
-                    "course_name":    name,
-                    "cta_link":       link,
-                    "price":          card_price,
-                    "pdp_price":      pdp_price,
-                    "cta_status":     cta_status,
-                    "is_broken":      is_broken,
-                    "price_mismatch": mismatch,
-                    "viewport":       self.viewport,
-                })
-
-            self.db.save_batch(scraped_batch, self.run_id)
+            self.db.save_batch(
+                self._verify_cards(pending, url, already_scraped), self.run_id
+            )
 
 
 class PLPHandler(BasePageHandler):
+    CARD_SELECTOR = 'li[data-testid^="card-"]'
+
     @staticmethod
     def can_handle(url):
         return "/online-coaching-" in url or (
@@ -510,32 +786,30 @@ class PLPHandler(BasePageHandler):
         if not self._navigate(url):
             return
         self.wait_for_cards(
-            'li[data-testid^="card-"]',
+            self.CARD_SELECTOR,
             url,
             "PLPHandler",
             api_re=WATCHDOG_PLP_API_RE,
         )
-        time.sleep(1)
 
-        pills_loc = self.page.locator("button").filter(
-            has_text=re.compile(
-                r"^(Live|Recorded|Online Test Series|Offline Test Series)$"
-            )
-        )
-        pill_count = pills_loc.count()
-        pills_info = [pills_loc.nth(i).inner_text().strip() for i in range(pill_count)]
+        pills = self.discover_tabs("button", _PLP_PILL_RE)
 
-        for p_idx in range(max(1, pill_count)):
-            pill_name = pills_info[p_idx] if pills_info else "Default"
-            logging.debug(f"  Filter: {pill_name}")
+        # Per-card loop locals
+        processed = self.processed_keys
+        already_scraped = self._already_scraped(url)
 
-            active_pill = pills_loc.nth(p_idx) if pills_info else None
+        for active_pill, pill_name in (pills if pills else [(None, "Default")]):
+            logging.debug(f"  Filter: {pill_name}")
             if active_pill:
-                active_pill.evaluate("el => el.click()")
-                time.sleep(2)
+                self._click_tab(active_pill)
 
-            cards = self.page.locator('li[data-testid^="card-"]')
-            if cards.count() == 0:
+            cards = self.page.locator(self.CARD_SELECTOR)
+            records = self.card_records(
+                cards,
+                ["p.font-semibold", "h2", "p"],
+                ['[class*="price"]', '[class*="fee"]', "h3"],
+            )
+            if not records:
                 logging.warning(
                     f"PLPHandler: Zero cards on pill '{pill_name}' at {url}"
                 )
@@ -543,52 +817,32 @@ class PLPHandler(BasePageHandler):
                 if WATCHDOG_FAIL_ON_EMPTY:
                     raise RuntimeError(f"PLPHandler: No cards found on {url}")
                 continue
-            scraped_batch = []
+            pending = []
 
-            for i in range(cards.count()):
-                if active_pill:
-                    active_pill.evaluate("el => el.click()")
-                    time.sleep(1)
+            for i, record in enumerate(records):
+                name = record["name"]
 
-                card = cards.nth(i)
-                name = self.safe_get_text(card, ["p.font-semibold", "h2", "p"])
-
-                if name == "N/A" or f"{pill_name}_{name}" in self.processed_keys:
+                key = (pill_name, name)
+                if name == "N/A" or key in processed:
                     continue
-                self.processed_keys.add(f"{pill_name}_{name}")
+                processed.add(key)
 
                 if "DLP" in name:
                     logging.debug(f"  [SKIP-DLP] {name}")
                     continue
 
                 logging.debug(f"    Card: {name}")
-                card_price = self.safe_get_text(
-                    card, ['[class*="price"]', '[class*="fee"]', "h3"]
-                )
-                link = self.extract_cta_link(card, active_pill, pill_name)
-                pdp_price, cta_status, is_broken, mismatch = self.verify_pdp(
-                    link, url, card_price
-                )
-
-                if is_broken:
-                    logging.warning(f"  ⚠️  Broken link for '{name}': {link}")
+                card_price = record["price"]
+                pending.append((name, card_price, self._card_link(record, cards.nth(i), active_pill, pill_name)))
 
-                scraped_batch.append({
-                    "base_url":       url,
-                    "course_name":    name,
-                    "cta_link":       link,
-                    "price":          card_price,
-                    "pdp_price":      pdp_price,
-                    "cta_status":     cta_status,
-                    "is_broken":      is_broken,
-                    "price_mismatch": mismatch,
-                    "viewport":       self.viewport,
-                })
-
-            self.db.save_batch(scraped_batch, self.run_id)
+            self.db.save_batch(
+                self._verify_cards(pending, url, already_scraped), self.run_id
+            )
 
 
 class StreamHandler(BasePageHandler):
+    CARD_SELECTOR = 'li[data-testid^="card-"]'
+
     @staticmethod
     def can_handle(url):
         return "/international-olympiads" in url
@@ -600,41 +854,31 @@ class StreamHandler(BasePageHandler):
         if not self._navigate(url):
             return
         self.wait_for_cards(
-            'li[data-testid^="card-"]',
+            self.CARD_SELECTOR,
             url,
             "StreamHandler",
             api_re=WATCHDOG_STREAM_API_RE,
         )
-        time.sleep(1)
 
-        tab_loc = self.page.locator("button").filter(
-            has_text=re.compile(r"^Class \d+\+?$")
-        )
-        tab_count = tab_loc.count()
-        tabs_info = []
-        for i in range(tab_count):
-            txt = tab_loc.nth(i).inner_text().strip()
-            if txt and txt not in tabs_info:
-                tabs_info.append(txt)
-
-        for t_idx in range(max(1, len(tabs_info))):
-            tab_name = tabs_info[t_idx] if tabs_info else "Default"
-            logging.debug(f"  Tab: {tab_name}")
+        tabs = self.discover_tabs("button", _STREAM_TAB_RE)
 
-            active_tab = None
-            if tabs_info:
-                active_tab = (
-                    self.page.locator("button").filter(has_text=tab_name).first
-                )
-                active_tab.evaluate("el => el.click()")
-                time.sleep(2)
+        # Per-card loop locals
+        processed = self.processed_keys
+        already_scraped = self._already_scraped(url)
+        safe_get_text = self.safe_get_text
+
+        for active_tab, tab_name in (tabs if tabs else [(None, "Default")]):
+            logging.debug(f"  Tab: {tab_name}")
+            if active_tab:
+                self._click_tab(active_tab)
 
             cards = (
                 self.page.locator("li")
                 .filter(has=self.page.locator("p"))
                 .filter(has=self.page.locator("h3"))
+                .all()
             )
-            if cards.count() == 0:
+            if not cards:
                 logging.warning(
                     f"StreamHandler: Zero cards on tab '{tab_name}' at {url}"
                 )
@@ -642,47 +886,27 @@ class StreamHandler(BasePageHandler):
                 if WATCHDOG_FAIL_ON_EMPTY:
                     raise RuntimeError(f"StreamHandler: No cards found on {url}")
                 continue
-            scraped_batch = []
+            pending = []
 
-            for i in range(cards.count()):
-                if active_tab:
-                    active_tab.evaluate("el => el.click()")
-                    time.sleep(1)
-
-                card = cards.nth(i)
+            for card in cards:
                 card.scroll_into_view_if_needed()
-                name = self.safe_get_text(card, ["p", "h2"])
+                name = safe_get_text(card, ["p", "h2"])
 
-                if name == "N/A" or f"{tab_name}_{name}" in self.processed_keys:
+                key = (tab_name, name)
+                if name == "N/A" or key in processed:
                     continue
-                self.processed_keys.add(f"{tab_name}_{name}")
+                processed.add(key)
 
                 if "DLP" in name:
                     logging.debug(f"  [SKIP-DLP] {name}")
                     continue
 
                 logging.debug(f"    Card: {name}")
-                card_price = self.safe_get_text(
-                    card, ["h3", '[class*="price"]']
-                )
-                link = self.extract_cta_link(card, active_tab, tab_name)
-                pdp_price, cta_status, is_broken, mismatch = self.verify_pdp(
-                    link, url, card_price
+                card_price = safe_get_text(card, ["h3", '[class*="price"]'])
+                pending.append(
+                    (name, card_price, self.extract_cta_link(card, active_tab, tab_name))
                 )
 
-                if is_broken:
-                    logging.warning(f"  ⚠️  Broken link for '{name}': {link}")
-
-                scraped_batch.append({
-                    "base_url":       url,
-                    "course_name":    name,
-                    "cta_link":       link,
-                    "price":          card_price,
-                    "pdp_price":      pdp_price,
-                    "cta_status":     cta_status,
-                    "is_broken":      is_broken,
-                    "price_mismatch": mismatch,
-                    "viewport":       self.viewport,
-                })
-
-            self.db.save_batch(scraped_batch, self.run_id)
+            self.db.save_batch(
+                self._verify_cards(pending, url, already_scraped), self.run_id
+            )
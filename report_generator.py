@@ -4,18 +4,55 @@ Produces a human-readable Markdown report for every WatchDog scraper run.
 Reports are saved to the reports/ directory with a timestamp in the filename.
 """
 
+import io
 import os
 import re
-import sqlite3
 import logging
+from collections import Counter
+from contextlib import closing
 from datetime import datetime
-from typing import List, Optional
+from functools import cached_property
+from typing import List, Optional, TextIO
+from database import connect_read_only  # type: ignore[import]
 from validation_service import ValidationService  # type: ignore[import]
-from constants import SEVERITY_ICONS, SEVERITY_ORDER  # type: ignore[import]
+from constants import ISSUE_TYPE_ORDER, SEVERITY_ICONS, SEVERITY_ORDER  # type: ignore[import]
 
 
 REPORTS_DIR = "reports"
 
+# Keys for the per-viewport stats dict, in the column order of the
+# _query_db_stats SELECT (after viewport).
+_DB_STAT_KEYS = (
+    "courses", "broken", "price_mismatch", "price_missing",
+    "price_correct", "cta_found", "cta_missing",
+)
+
+# Bound formatter for one Issue Details row; takes a 6-tuple of cell values.
+_format_detail_row = "| %s | %s | %s | %s | %s | %s |\n".__mod__
+
+# Summary table rows: (db_stats key, label, Total-column format). Issue
+# counts are bolded in the Total column.
+_SUMMARY_ROWS = (
+    ("courses",        "Courses scraped",    "%d"),
+    ("broken",         "Broken links",       "**%d**"),
+    ("price_missing",  "Price missing",      "%d"),
+    ("price_correct",  "Price correct ✅",   "%d"),
+    ("price_mismatch", "Price mismatches",   "**%d**"),
+    ("cta_found",      "CTA found on PDP",   "%d"),
+    ("cta_missing",    "CTA missing on PDP", "**%d**"),
+)
+
+# (icon, severity) pairs for the By Severity table, resolved once at import.
+_SEVERITY_ROWS = tuple((SEVERITY_ICONS.get(sev, ""), sev) for sev in SEVERITY_ORDER)
+
+
+def _ordered_types(by_type: dict) -> list:
+    """Keys of *by_type* in ISSUE_TYPE_ORDER, unknown types sorted at the end."""
+    ordered = [t for t in ISSUE_TYPE_ORDER if t in by_type]
+    if len(ordered) < len(by_type):
+        ordered.extend(sorted(by_type.keys() - set(ISSUE_TYPE_ORDER)))
+    return ordered
+
 
 class ReportGenerator:
     """
@@ -67,9 +104,10 @@ class ReportGenerator:
         filename = f"{base_name}_{suffix}.md"
         filepath = os.path.join(REPORTS_DIR, filename)
 
-        content = self._build_report()
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        # Sections stream straight into the file; the 64 KiB buffer batches
+        # the many small row writes into a handful of syscalls.
+        with open(filepath, "w", encoding="utf-8", buffering=1 << 16) as f:
+            self._build_report(f)
 
         logging.info(f"Report saved → {filepath}")
         return filepath
@@ -88,7 +126,9 @@ class ReportGenerator:
                            (e.g. "Guest Pass", "Authenticated — JEE / 11th").
                            If empty, no heading is prepended.
         """
-        raw = self._build_report()
+        buf = io.StringIO()
+        self._build_report(buf)
+        raw = buf.getvalue()
         # Shift ## → ###
         shifted = re.sub(r"^## ", "### ", raw, flags=re.MULTILINE)
         # Remove the standalone top-level title line and the blank line after it
@@ -102,29 +142,42 @@ class ReportGenerator:
     # Report building
     # ------------------------------------------------------------------
 
-    def _build_report(self) -> str:
-        duration = self.end_time - self.start_time
-        total_seconds = int(duration.total_seconds())
-        duration_str = f"{total_seconds // 60}m {total_seconds % 60}s"
+    def _build_report(self, out: TextIO) -> None:
+        """Write the full report to *out* (a file or any text stream)."""
+        mins, secs = divmod(int((self.end_time - self.start_time).total_seconds()), 60)
+        duration_str = f"{mins}m {secs}s"
 
-        summary = self.vs.get_summary()
-        db_stats = self._query_db_stats()
         issues = self.vs.validation_results
 
-        sections = [
-            self._section_header(duration_str),
-            self._section_recheck_summary(),
-            self._section_summary(summary, db_stats),
-            self._section_url_summary(issues),
-            self._section_issue_breakdown(summary),
-            self._section_details(issues),
-        ]
-        return "\n\n".join(sections) + "\n"
-
-    def _section_recheck_summary(self) -> str:
+        # Nothing was scraped and nothing was flagged (e.g. a dry run): the
+        # header is the whole report, so skip the DB query entirely.
+        if not self.urls_scraped and not issues:
+            self._section_header(out, duration_str)
+            out.write("\nℹ️ No URLs were scraped in this run.\n")
+            return
+
+        summary = self.vs.get_summary()
+        db_stats = self.db_stats
+
+        # Every section writes into the same stream; sections are separated
+        # by a single blank line.
+        self._section_header(out, duration_str)
+        if self.recheck_stats:
+            out.write("\n")
+            self._section_recheck_summary(out)
+        out.write("\n")
+        self._section_summary(out, summary, db_stats)
+        out.write("\n")
+        self._section_url_summary(out, issues)
+        out.write("\n")
+        self._section_issue_breakdown(out, summary)
+        out.write("\n")
+        self._section_details(out, issues)
+
+    def _section_recheck_summary(self, buf: TextIO) -> None:
         """Render the Re-QC pass summary block."""
         if not self.recheck_stats:
-            return ""
+            return
 
         first  = self.recheck_stats.get('first_pass_issues', 0)
         final  = self.recheck_stats.get('final_pass_issues', 0)
@@ -144,169 +197,144 @@ class ReportGenerator:
                 f"**{final}** issue(s) remain as genuine, persistent problems."
             )
 
-        lines = [
-            "## Re-QC Summary",
-            "",
-            "| Pass | Issues Found |",
-            "|------|--------------|",
-            f"| Initial validation pass | {first} |",
-            f"| Cleared on re-check ✅ | {cleared} |",
-            f"| **Persistent issues (final)** | **{final}** |",
-            "",
-            recheck_note,
-        ]
-        return "\n".join(lines)
-
-    def _section_header(self, duration_str: str) -> str:
+        buf.write(
+            "## Re-QC Summary\n"
+            "\n"
+            "| Pass | Issues Found |\n"
+            "|------|--------------|\n"
+        )
+        buf.write(f"| Initial validation pass | {first} |\n")
+        buf.write(f"| Cleared on re-check ✅ | {cleared} |\n")
+        buf.write(f"| **Persistent issues (final)** | **{final}** |\n")
+        buf.write("\n")
+        buf.write(recheck_note)
+        buf.write("\n")
+
+    def _section_header(self, buf: TextIO, duration_str: str) -> None:
         # Build the Mode row
         if self.mode == "authenticated" and self.profile:
             mode_str = f"Authenticated — {self.profile}"
         else:
             mode_str = "Guest"
 
-        lines = [
-            f"# WatchDog Run Report",
-            f"",
-            f"| | |",
-            f"|---|---|",
-            f"| **Date** | {self.start_time.strftime('%Y-%m-%d %H:%M:%S')} |",
-            f"| **Duration** | {duration_str} |",
-            f"| **Mode** | {mode_str} |",
-            f"| **URLs Scraped** | {len(self.urls_scraped)} |",
-            f"| **Viewports** | Desktop (1920×1080), Mobile — iPhone XR (390×844) |",
-        ]
+        buf.write(
+            "# WatchDog Run Report\n"
+            "\n"
+            "| | |\n"
+            "|---|---|\n"
+        )
+        buf.write(f"| **Date** | {self.start_time.strftime('%Y-%m-%d %H:%M:%S')} |\n")
+        buf.write(f"| **Duration** | {duration_str} |\n")
+        buf.write(f"| **Mode** | {mode_str} |\n")
+        buf.write(f"| **URLs Scraped** | {len(self.urls_scraped)} |\n")
+        buf.write("| **Viewports** | Desktop (1920×1080), Mobile — iPhone XR (390×844) |\n")
         if self.urls_scraped:
-            lines += ["", "**URLs:**"]
-            lines += [f"- `{u}`" for u in self.urls_scraped]
-        return "\n".join(lines)
-
-    def _section_summary(self, summary: dict, db_stats: dict) -> str:
-        desktop = db_stats.get("desktop", {})
-        mobile = db_stats.get("mobile", {})
-
-        def stat(key: str) -> tuple:
+            buf.write("\n**URLs:**\n")
+            for u in self.urls_scraped:
+                buf.write(f"- `{u}`\n")
+
+    def _section_summary(self, buf: TextIO, summary: dict, db_stats: dict) -> None:
+        desktop = db_stats.get("desktop") or {}
+        mobile = db_stats.get("mobile") or {}
+
+        buf.write(
+            "## Summary\n"
+            "\n"
+            "| Metric | Desktop | Mobile | Total |\n"
+            "|--------|--------:|-------:|------:|\n"
+        )
+        for key, label, total_fmt in _SUMMARY_ROWS:
             d = desktop.get(key, 0)
             m = mobile.get(key, 0)
-            return d, m, d + m
-
-        d_courses, m_courses, t_courses = stat("courses")
-        d_broken, m_broken, t_broken = stat("broken")
-        d_p_missing, m_p_missing, t_p_missing = stat("price_missing")
-        d_p_correct, m_p_correct, t_p_correct = stat("price_correct")
-        d_mismatch, m_mismatch, t_mismatch = stat("price_mismatch")
-        d_cta_found, m_cta_found, t_cta_found = stat("cta_found")
-        d_cta_missing, m_cta_missing, t_cta_missing = stat("cta_missing")
-
-        lines = [
-            "## Summary",
-            "",
-            "| Metric | Desktop | Mobile | Total |",
-            "|--------|--------:|-------:|------:|",
-            f"| Courses scraped | {d_courses} | {m_courses} | {t_courses} |",
-            f"| Broken links | {d_broken} | {m_broken} | **{t_broken}** |",
-            f"| Price missing | {d_p_missing} | {m_p_missing} | {t_p_missing} |",
-            f"| Price correct ✅ | {d_p_correct} | {m_p_correct} | {t_p_correct} |",
-            f"| Price mismatches | {d_mismatch} | {m_mismatch} | **{t_mismatch}** |",
-            f"| CTA found on PDP | {d_cta_found} | {m_cta_found} | {t_cta_found} |",
-            f"| CTA missing on PDP | {d_cta_missing} | {m_cta_missing} | **{t_cta_missing}** |",
-            f"| **Validation issues** | | | **{summary.get('total_issues', 0)}** |",
-        ]
-        return "\n".join(lines)
-
-    def _section_url_summary(self, issues: list) -> str:
+            buf.write(f"| {label} | {d} | {m} | {total_fmt % (d + m)} |\n")
+        buf.write(f"| **Validation issues** | | | **{summary.get('total_issues', 0)}** |\n")
+
+    def _section_url_summary(self, buf: TextIO, issues: list) -> None:
         if not issues:
-            return "## Errors by URL\n\n✅ No errors found."
-            
-        # Group issues by base_url
-        url_counts = {}
-        for issue in issues:
-            url = getattr(issue, 'base_url', 'Unknown URL')
-            url_counts[url] = url_counts.get(url, 0) + 1
-            
-        lines = [
-            "## Errors by URL",
-            "",
-            "| URL | Issue Count |",
-            "|-----|-------------|"
-        ]
-        
-        # Sort by issue count descending
-        for url, count in sorted(url_counts.items(), key=lambda x: x[1], reverse=True):
-            lines.append(f"| {url} | **{count}** |")
-            
-        return "\n".join(lines)
-
-    def _section_issue_breakdown(self, summary: dict) -> str:
+            buf.write("## Errors by URL\n\n✅ No errors found.\n")
+            return
+
+        # Count issues per base_url in C rather than a Python dict loop
+        url_counts = Counter(issue.base_url for issue in issues)
+
+        buf.write(
+            "## Errors by URL\n"
+            "\n"
+            "| URL | Issue Count |\n"
+            "|-----|-------------|\n"
+        )
+
+        # Sorted by issue count descending
+        for url, count in url_counts.most_common():
+            buf.write(f"| {url} | **{count}** |\n")
+
+    def _section_issue_breakdown(self, buf: TextIO, summary: dict) -> None:
         if not summary.get("total_issues"):
-            return "## Validation Issues\n\n✅ No issues found."
+            buf.write("## Validation Issues\n\n✅ No issues found.\n")
+            return
 
         by_type = summary.get("by_type", {})
         by_severity = summary.get("by_severity", {})
 
-        lines = [
-            "## Validation Issues",
-            "",
-            f"**Total: {summary['total_issues']}**",
-            "",
-            "### By Type",
-            "",
-            "| Type | Count |",
-            "|------|------:|",
-        ]
-        for t, count in sorted(by_type.items()):
-            lines.append(f"| {t} | {count} |")
-
-        lines += [
-            "",
-            "### By Severity",
-            "",
-            "| Severity | Count |",
-            "|----------|------:|",
-        ]
-        for sev in SEVERITY_ORDER:
-            count = by_severity.get(sev, 0)
-            icon = SEVERITY_ICONS.get(sev, "")
-            lines.append(f"| {icon} {sev} | {count} |")
-
-        return "\n".join(lines)
-
-    def _section_details(self, issues: list) -> str:
+        buf.write(f"## Validation Issues\n\n**Total: {summary['total_issues']}**\n")
+        buf.write(
+            "\n"
+            "### By Type\n"
+            "\n"
+            "| Type | Count |\n"
+            "|------|------:|\n"
+        )
+        for t in _ordered_types(by_type):
+            buf.write(f"| {t} | {by_type[t]} |\n")
+
+        buf.write(
+            "\n"
+            "### By Severity\n"
+            "\n"
+            "| Severity | Count |\n"
+            "|----------|------:|\n"
+        )
+        for icon, sev in _SEVERITY_ROWS:
+            buf.write(f"| {icon} {sev} | {by_severity.get(sev, 0)} |\n")
+
+    def _section_details(self, buf: TextIO, issues: list) -> None:
         if not issues:
-            return "## Issue Details\n\n✅ No issues to report."
+            buf.write("## Issue Details\n\n✅ No issues to report.\n")
+            return
 
-        # Group by type
-        by_type: dict = {}
+        # Single pass: render each row as it is grouped by type.
+        rows_by_type: dict = {}
+        fmt = _format_detail_row
         for issue in issues:
-            by_type.setdefault(issue.type, []).append(issue)
-
-        lines = ["## Issue Details"]
-
-        for issue_type, type_issues in sorted(by_type.items()):
-            lines += [
-                "",
-                f"### {issue_type.replace('_', ' ').title()} ({len(type_issues)})",
-                "",
-                "| Course | URL | Viewport | Field | Expected | Actual |",
-                "|--------|-----|----------|-------|----------|--------|",
-            ]
-            for issue in type_issues:
-                # Viewport is embedded in course_data when the validator runs;
-                # fall back gracefully if not present
-                viewport = getattr(issue, "viewport", "—")
-                url = getattr(issue, "base_url", "—")
-                expected = str(issue.expected or "—").replace("|", "\\|")
-                actual = str(issue.actual or "—").replace("|", "\\|")
-                field = issue.field or "—"
-                lines.append(
-                    f"| {issue.course_name} | {url} | {viewport} | {field} | {expected} | {actual} |"
-                )
-
-        return "\n".join(lines)
+            rows_by_type.setdefault(issue.type, []).append(fmt((
+                issue.course_name,
+                issue.base_url,
+                issue.viewport,
+                issue.field or "—",
+                issue.md_expected,
+                issue.md_actual,
+            )))
+
+        buf.write("## Issue Details\n")
+
+        for issue_type in _ordered_types(rows_by_type):
+            rows = rows_by_type[issue_type]
+            buf.write(f"\n### {issue_type.replace('_', ' ').title()} ({len(rows)})\n\n")
+            buf.write(
+                "| Course | URL | Viewport | Field | Expected | Actual |\n"
+                "|--------|-----|----------|-------|----------|--------|\n"
+            )
+            buf.writelines(rows)
 
     # ------------------------------------------------------------------
     # DB helpers
     # ------------------------------------------------------------------
 
+    @cached_property
+    def db_stats(self) -> dict:
+        """Per-viewport DB counts, queried once per generator instance."""
+        return self._query_db_stats()
+
     def _query_db_stats(self) -> dict:
         """Return per-viewport counts from the DB, scoped to the current run_id."""
         stats: dict = {}
@@ -316,37 +344,44 @@ class ReportGenerator:
             where = "WHERE run_id = ?" if self.run_id is not None else ""
             params = (self.run_id,) if self.run_id is not None else ()
 
-            with sqlite3.connect(self.db_name, timeout=10) as conn:
+            # isolation_level=None: no implicit transactions from the sqlite3
+            # module; the read below runs inside one explicit deferred BEGIN.
+            # Under WAL that snapshot never waits on in-flight scraper writes.
+            # sqlite3's default 5 s busy timeout is kept as a safety net for
+            # the rare moments (WAL recovery) when a reader can still be told
+            # to wait, rather than dropping the stats table from the report.
+            # connect_read_only applies the read-path PRAGMAs (in-memory temp
+            # store for the GROUP BY, mmap reads).
+            with closing(connect_read_only(self.db_name, isolation_level=None)) as conn:
+                conn.execute("BEGIN")
                 for row in conn.execute(
                     f"""
+                    WITH c AS (
+                        SELECT
+                            viewport,
+                            is_broken,
+                            price_mismatch,
+                            cta_status,
+                            COALESCE(pdp_price, '') IN ('Not Found','N/A','Error','') AS pdp_missing
+                        FROM courses
+                        {where}
+                    )
                     SELECT
                         viewport,
                         COUNT(*)                                                        AS courses,
-                        SUM(is_broken)                                                  AS broken,
-                        SUM(price_mismatch)                                             AS price_mismatch,
-                        SUM(CASE WHEN pdp_price IN ('Not Found','N/A','Error','')
-                                  OR pdp_price IS NULL                  THEN 1 ELSE 0 END) AS price_missing,
-                        SUM(CASE WHEN (pdp_price NOT IN ('Not Found','N/A','Error','')
-                                  AND pdp_price IS NOT NULL)
-                                  AND price_mismatch = 0               THEN 1 ELSE 0 END) AS price_correct,
-                        SUM(CASE WHEN cta_status LIKE 'Found%' THEN 1 ELSE 0 END)      AS cta_found,
-                        SUM(CASE WHEN cta_status = 'Not Found' THEN 1 ELSE 0 END)      AS cta_missing
-                    FROM courses
-                    {where}
+                        COUNT(*) FILTER (WHERE is_broken = 1)                           AS broken,
+                        COUNT(*) FILTER (WHERE price_mismatch = 1)                      AS price_mismatch,
+                        COUNT(*) FILTER (WHERE pdp_missing)                             AS price_missing,
+                        COUNT(*) FILTER (WHERE NOT pdp_missing AND price_mismatch = 0)  AS price_correct,
+                        COUNT(*) FILTER (WHERE substr(cta_status, 1, 5) = 'Found')      AS cta_found,
+                        COUNT(*) FILTER (WHERE cta_status = 'Not Found')                AS cta_missing
+                    FROM c
                     GROUP BY viewport
                     """,
                     params,
                 ):
-                    viewport = row[0] or "unknown"
-                    stats[viewport] = {
-                        "courses":        row[1] or 0,
-                        "broken":         row[2] or 0,
-                        "price_mismatch": row[3] or 0,
-                        "price_missing":  row[4] or 0,
-                        "price_correct":  row[5] or 0,
-                        "cta_found":      row[6] or 0,
-                        "cta_missing":    row[7] or 0,
-                    }
+                    # COUNT(*) FILTER is never NULL, so the counts map as-is.
+                    stats[row[0] or "unknown"] = dict(zip(_DB_STAT_KEYS, row[1:]))
         except Exception as e:
             logging.warning(f"Could not query DB stats for report: {e}")
         return stats
@@ -19,12 +19,13 @@ The heavy lifting lives in the focused sub-modules:
 
 import logging
 import os
+import queue
 import re
-import sqlite3
 import sys
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import cached_property
 from typing import Dict, List, Optional, Set, Tuple
 
 # pyre-ignore-all-errors[21]  -- local script modules are not installed packages;
@@ -33,7 +34,7 @@ from playwright.sync_api import sync_playwright  # pyre-fixme[21]
 from playwright_stealth import Stealth           # pyre-fixme[21]
 
 from database import DatabaseManager            # pyre-fixme[21]
-from cache import PdpCache, ProgressTracker     # pyre-fixme[21]
+from cache import NetworkCache, PdpCache, ProgressTracker  # pyre-fixme[21]
 from handlers import (  # type: ignore[import]
     HomepageHandler,
     PLPHandler,
@@ -44,6 +45,7 @@ from handlers import (  # type: ignore[import]
     WATCHDOG_RETRY_BACKOFF_MS,
     WATCHDOG_FAIL_ON_EMPTY,
     WATCHDOG_ARTIFACT_DIR,
+    install_request_routing,
 )
 from validation_service import ValidationService  # type: ignore[import]
 from url_config import UrlConfig                  # type: ignore[import]
@@ -73,6 +75,32 @@ STEALTH = Stealth()
 
 
 
+def _new_context(browser, context_kwargs, asset_cache):
+    """Open a stealth context with request routing installed at context level,
+    so the listing page, the PDP page and any popup a CTA click opens are all
+    filtered."""
+    context = browser.new_context(**context_kwargs)
+    STEALTH.apply_stealth_sync(context)
+    install_request_routing(context, asset_cache)
+    return context
+
+
+# Section tag for a URL missing from the config (recheck fallback). One
+# anchored match; the alternatives are tried in order, so PLP wins over
+# stream, and the group that matched names the tag.
+_TAG_GUESS_RE = re.compile(
+    r"^(?:(?=.*(?:/online-coaching-|/neet/))(?P<PLP_PAGES>)"
+    r"|(?=.*/international-olympiads)(?P<STREAM_PAGES>)"
+    r"|(?P<HOME>https://allen\.in/*$))"
+)
+
+
+def _guess_tag(url: str) -> str:
+    m = _TAG_GUESS_RE.match(url)
+    # Anything else goes to StreamHandler, which handles RESULTS_PAGES too
+    return m.lastgroup if m else "STREAM_PAGES"
+
+
 # ---------------------------------------------------------------------------
 # Engine
 # ---------------------------------------------------------------------------
@@ -81,6 +109,8 @@ class ScraperEngine:
     def __init__(self, config_file: str = "config/urls.yaml"):
         self.config_file = config_file
         self.db = DatabaseManager()
+        # Immutable JS/CSS bundles, shared by every context in the run
+        self.asset_cache = NetworkCache()
         self.handler_map = {
             "HOME":          HomepageHandler,
             "PLP_PAGES":     PLPHandler,
@@ -88,10 +118,15 @@ class ScraperEngine:
             "RESULTS_PAGES": StreamHandler,
         }
 
+    @cached_property
+    def url_config(self) -> UrlConfig:
+        """config/urls.yaml, read once and shared by the guest, recheck and
+        authenticated passes."""
+        return UrlConfig.load(self.config_file)
+
     def parse_urls(self) -> List[Tuple[str, str]]:
         """Return all (section, url) pairs from config/urls.yaml for the guest pass."""
-        url_config = UrlConfig.load(self.config_file)
-        tasks = url_config.get_all_tasks()
+        tasks = self.url_config.get_all_tasks()
         if not tasks:
             logging.error("URL config %s is missing or empty.", self.config_file)
         return tasks
@@ -103,20 +138,32 @@ class ScraperEngine:
         context_kwargs: Dict[str, object],
         run_id: int,
         pdp_cache: Optional[PdpCache] = None,
+        incremental: bool = True,
     ) -> None:
-        """Scrape all tasks under one browser context (one viewport pass)."""
+        """Scrape all tasks under one browser context (one viewport pass).
+
+        incremental=False re-verifies every card even when WATCHDOG_INCREMENTAL
+        is on; re-check passes use it so earlier runs can't mask a failure.
+        """
         progress = ProgressTracker(len(tasks), label)
         logging.info(f"[{label.upper()}] ▶  Starting — {len(tasks)} URLs")
 
         MAX_URL_WORKERS = max(1, WATCHDOG_MAX_WORKERS)
         logging.info(f"[{label.upper()}] Using MAX_WORKERS={MAX_URL_WORKERS}")
-        task_chunks: List[List[Tuple[str, str]]] = [list(tasks[i::MAX_URL_WORKERS]) for i in range(MAX_URL_WORKERS)]  # type: ignore[index]
-        task_chunks = [c for c in task_chunks if c]
-        if not task_chunks:
+        if not tasks:
             logging.info(f"[{label.upper()}] ✔  No URLs to process")
             return
 
-        def _scrape_worker(worker_tasks: list):
+        # Workers pull URLs from one shared queue, so a slow page only holds
+        # up its own worker instead of a pre-assigned slice of the list.
+        # Items are (tag, url, prefix); prefix is None until the URL is first
+        # picked up, so a re-queued URL keeps its progress number.
+        work: "queue.SimpleQueue[Tuple[str, str, Optional[str]]]" = queue.SimpleQueue()
+        for tag, url in tasks:
+            work.put((tag, url, None))
+        num_workers = min(MAX_URL_WORKERS, len(tasks))
+
+        def _scrape_worker():
             with sync_playwright() as pw:
                 launch_args = [
                     "--disable-dev-shm-usage",
@@ -135,13 +182,20 @@ class ScraperEngine:
                         return False
 
                     fatal_error = False
+                    # One context per worker, reused across its URLs so cookies
+                    # and storage stay warm; each URL gets fresh pages. The
+                    # context-level route disables the browser HTTP cache, so
+                    # assets carry over between URLs only via self.asset_cache.
+                    context = None
                     try:
-                        logging.info(
-                            f"[{label.upper()}] Using {browser_type.name} "
-                            f"for {len(worker_tasks)} URLs"
-                        )
-                        for tag, url in worker_tasks:
-                            prefix = progress.advance()
+                        logging.info(f"[{label.upper()}] Worker using {browser_type.name}")
+                        while True:
+                            try:
+                                tag, url, prefix = work.get_nowait()
+                            except queue.Empty:
+                                break
+                            if prefix is None:
+                                prefix = progress.advance()
                             handler_class = self.handler_map.get(tag)
                             if not handler_class:
                                 logging.warning(
@@ -153,25 +207,32 @@ class ScraperEngine:
                             logging.info(f"{prefix} 🔄 {url}")
                             t0 = time.time()
                             success = True
-                            context = None
                             handler = None
+                            page = pdp_page = None
 
                             try:
-                                context = browser.new_context(**context_kwargs)
-                                STEALTH.apply_stealth_sync(context)
+                                if context is None:
+                                    context = _new_context(
+                                        browser, context_kwargs, self.asset_cache
+                                    )
                                 page = context.new_page()
+                                # PDPs open in their own page so the listing keeps its state.
+                                pdp_page = context.new_page()
                                 handler = handler_class(
                                     page,
                                     self.db,
                                     viewport=label,
                                     run_id=run_id,
                                     pdp_cache=pdp_cache,
+                                    pdp_page=pdp_page,
+                                    incremental=incremental,
                                 )
                                 handler.scrape(url)
                             except Exception as e:
                                 err_msg = str(e)
                                 if "Target page, context or browser has been closed" in err_msg:
                                     fatal_error = True
+                                    work.put((tag, url, prefix))  # retry with the fallback browser
                                     logging.warning(
                                         f"[{label.upper()}] {browser_type.name} crashed "
                                         f"while scraping {url}: {err_msg}"
@@ -183,9 +244,22 @@ class ScraperEngine:
                                     handler._capture_artifacts(
                                         handler_class.__name__, url, "exception"
                                     )
+                                # Don't carry a possibly broken context into the next URL
+                                if context is not None:
+                                    try:
+                                        context.close()
+                                    except Exception as close_err:
+                                        logging.debug(f"Could not close context: {close_err}")
+                                    context = None
                             finally:
-                                if context:
-                                    context.close()
+                                if handler is not None:
+                                    handler.close()
+                                for pg in (page, pdp_page):
+                                    if pg is not None and context is not None:
+                                        try:
+                                            pg.close()
+                                        except Exception as close_err:
+                                            logging.debug(f"Could not close page: {close_err}")
 
                             elapsed = time.time() - t0
                             if success:
@@ -213,14 +287,16 @@ class ScraperEngine:
                         f"[{label.upper()}] All supported browsers failed for this worker."
                     )
 
-        with ThreadPoolExecutor(max_workers=len(task_chunks)) as url_pool:
-            futures = [url_pool.submit(_scrape_worker, chunk) for chunk in task_chunks]  # type: ignore[arg-type]
+        with ThreadPoolExecutor(max_workers=num_workers) as url_pool:
+            futures = [url_pool.submit(_scrape_worker) for _ in range(num_workers)]
             for future in as_completed(futures):
                 try:
                     future.result()
                 except Exception as e:
                     logging.error(f"[{label.upper()}] Unhandled worker error: {e}")
 
+        # Make this pass visible to the read-only validation/report connections.
+        self.db.flush()
         logging.info(f"[{label.upper()}] ✔  All {len(tasks)} URLs done")
 
     def recheck_failing_urls(
@@ -275,25 +351,17 @@ class ScraperEngine:
             "mobile": mobile_kwargs,
         }
 
-        # Group by viewport so we open one browser context per viewport type
+        # Group by viewport so we open one browser context per viewport type.
+        # Infer the page type (tag) from what was originally used; the config
+        # is loaded once and the first tag listed for a URL wins.
+        tag_by_url: Dict[str, str] = {}
+        for t, u in self.parse_urls():
+            tag_by_url.setdefault(u, t)
+
         by_viewport: dict = {}
         for base_url, viewport in failing_pairs:
-            # Infer the page type (tag) from what was originally used
-            tag = None
-            for t, u in self.parse_urls():
-                if u == base_url:
-                    tag = t
-                    break
-            if tag is None:
-                # Best-effort fallback: guess from URL pattern
-                if "/online-coaching-" in base_url or "/neet/" in base_url:
-                    tag = "PLP_PAGES"
-                elif "/international-olympiads" in base_url:
-                    tag = "STREAM_PAGES"
-                elif base_url.strip("/") == "https://allen.in":
-                    tag = "HOME"
-                else:
-                    tag = "STREAM_PAGES"  # Fallback — handles RESULTS_PAGES too
+            # Best-effort fallback: guess from URL pattern
+            tag = tag_by_url.get(base_url) or _guess_tag(base_url)
             by_viewport.setdefault(viewport, []).append((tag, base_url))
 
         # Use a fresh cache so stale first-pass results don't bleed in
@@ -301,18 +369,10 @@ class ScraperEngine:
 
         def _delete_old_rows(viewport_label: str, urls: list):
             """Remove the first-pass rows for these URLs so fresh data replaces them."""
-            import sqlite3
-            placeholders = ",".join(["?"] * len(urls))
-            with sqlite3.connect(self.db.db_name, timeout=30) as conn:
-                conn.execute(
-                    f"DELETE FROM courses "
-                    f"WHERE run_id=? AND viewport=? AND base_url IN ({placeholders})",
-                    [run_id, viewport_label] + urls,
-                )
-                conn.commit()
+            deleted = self.db.delete_url_rows(run_id, viewport_label, urls)
             logging.info(
                 f"[RECHECK][{viewport_label.upper()}] "
-                f"Deleted {len(urls)} old row(s) for re-scrape."
+                f"Deleted {deleted} old row(s) for re-scrape."
             )
 
         from concurrent.futures import ThreadPoolExecutor, as_completed as _as_completed
@@ -323,7 +383,8 @@ class ScraperEngine:
                 urls_only = [u for _, u in tasks]
                 _delete_old_rows(vp_label, urls_only)
                 f = pool.submit(  # type: ignore[arg-type]
-                    self._run_viewport, tasks, vp_label, context_kwargs, run_id, recheck_cache
+                    self._run_viewport, tasks, vp_label, context_kwargs, run_id, recheck_cache,
+                    incremental=False,
                 )
                 futures[f] = vp_label
             for future in _as_completed(futures):
@@ -336,6 +397,12 @@ class ScraperEngine:
         logging.info("[RECHECK] ✔  Re-scrape complete.")
 
     def run(self) -> None:
+        try:
+            self._run()
+        finally:
+            self.db.close()
+
+    def _run(self) -> None:
         tasks = self.parse_urls()
         if not tasks:
             logging.warning("No scraping tasks found.")
@@ -349,11 +416,17 @@ class ScraperEngine:
             WATCHDOG_FAIL_ON_EMPTY, WATCHDOG_ARTIFACT_DIR,
         )
 
+        # Commit scraped rows in large batches; _run_viewport flushes at the
+        # end of every pass and run() closes (and flushes) on the way out.
+        self.db.begin()
         run_id     = self.db.create_run()
         start_time = datetime.now()
         url_list   = [url for _, url in tasks]
         pdp_cache  = PdpCache()
 
+        # Resolved once and reused by the recheck and authenticated passes.
+        # Each viewport worker thread still starts its own Playwright driver
+        # and browser: sync_api objects cannot be shared across threads.
         with sync_playwright() as p:
             mobile_kwargs = dict(p.devices[MOBILE_DEVICE])
 
@@ -408,9 +481,6 @@ class ScraperEngine:
         # self-heal on a second attempt.  We update the DB rows in-place so
         # the final validation reflects only genuine, persistent issues.
         # ------------------------------------------------------------------
-        with sync_playwright() as p:
-            mobile_kwargs = dict(p.devices[MOBILE_DEVICE])
-
         self.recheck_failing_urls(
             failing_issues=first_pass_issues,
             run_id=run_id,
@@ -419,10 +489,12 @@ class ScraperEngine:
 
         logging.info("")
         logging.info("[RECHECK] Running final validation after re-check pass...")
-        final_validator = ValidationService(self.db.db_name)
+        # Same service: the second scan reuses its read-only connection.
+        final_validator = validator
         final_pass_issues = final_validator.validate_all_courses(run_id=run_id)
         final_pass_count  = len(final_pass_issues)
         final_validator.log_results()
+        final_validator.close()
 
         cleared_count = max(0, first_pass_count - final_pass_count)
         logging.info(
@@ -449,13 +521,13 @@ class ScraperEngine:
         # -----------------------------------------------------------------------
         # Phase 2 — Authenticated mode: one run per stream × class session
         # -----------------------------------------------------------------------
-        url_config = UrlConfig.load(self.config_file)
+        url_config = self.url_config
         auth_sessions = url_config.auth_sessions
         logging.info("")
         logging.info("Starting authenticated runs (%d sessions)...", len(auth_sessions))
 
         with sync_playwright() as p_auth:
-            mobile_kwargs_auth = dict(p_auth.devices[MOBILE_DEVICE])
+            mobile_kwargs_auth = dict(mobile_kwargs)
 
             # Launch a single browser for all authenticated profiles
             auth_browser = p_auth.chromium.launch(headless=True)
@@ -552,13 +624,13 @@ class ScraperEngine:
                             "[AUTH:%s] Re-QC: re-scraping %d failing pairs...",
                             profile_label, auth_recheck_count,
                         )
-                        recheck_cache = ProgressTracker()
+                        recheck_cache = PdpCache()
                         with ThreadPoolExecutor(max_workers=2) as rpool:
                             rfutures = {
                                 rpool.submit(
                                     self._run_viewport, tasks, label,
                                     auth_desktop_kwargs if label == "desktop" else auth_mobile_kwargs,
-                                    auth_run_id, auth_cache, recheck_cache
+                                    auth_run_id, recheck_cache, incremental=False,
                                 ): label
                                 for label in ("desktop", "mobile")
                             }
@@ -568,9 +640,10 @@ class ScraperEngine:
                                 except Exception as re:
                                     logging.error("[AUTH:%s] Re-QC viewport failed: %s", profile_label, re)
 
-                        final_validator = ValidationService(self.db.db_name)
+                        final_validator = auth_validator
                         auth_recheck_issues = final_validator.validate_all_courses(run_id=auth_run_id)
                         final_validator.log_results()
+                    auth_validator.close()
 
                     # Use final_validator if re-QC ran, otherwise auth_validator
                     _report_validator = final_validator if auth_recheck_count else auth_validator
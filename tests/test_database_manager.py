@@ -5,13 +5,20 @@ Covers:
 - Schema creation: runs and courses tables exist, WAL mode enabled
 - create_run: returns int, successive runs get different/increasing IDs
 - save_batch: all fields persisted, viewport stored, defaults applied,
-  multiple courses in one batch
+  multiple courses in one batch, duplicates within a run ignored
 - get_url_stats: card counts, issue counts (broken / price_mismatch / cta_missing),
   viewport filtering, run_id filtering, unknown URL returns zeros
+- begin/flush: deferred commits, auto-flush threshold, close() flushes
+- delete_url_rows: run/viewport/URL scoping
+- get_seen_courses: (name, link) pairs across runs, URL/viewport scoping
+- connect: shared PRAGMAs applied
+- connect_read_only: reads committed rows, rejects writes
 """
+import logging
 import sqlite3
+import threading
 import pytest
-from database import DatabaseManager
+from database import DatabaseManager, connect, connect_read_only
 
 
 # ---------------------------------------------------------------------------
@@ -64,6 +71,42 @@ class TestSchemaCreation:
             mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
         assert mode == "wal"
 
+    def test_report_index_exists(self, dm):
+        with sqlite3.connect(dm.db_name) as conn:
+            indexes = {r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index'"
+            )}
+        assert "idx_courses_report" in indexes
+
+    def test_legacy_duplicates_removed_and_dedup_index_created(self, dm):
+        run_id = dm.create_run()
+        dm.save_batch([_clean_course(), _clean_course(course_name="Other")], run_id)
+        dm.close()
+        # Simulate a database from before ux_courses_dedup existed
+        with sqlite3.connect(dm.db_name) as conn:
+            conn.execute("DROP INDEX ux_courses_dedup")
+            conn.execute(
+                "INSERT INTO courses (run_id, base_url, course_name, cta_link, price, viewport) "
+                "VALUES (?, 'https://example.com/plp', 'Test Course', "
+                "'https://example.com/course', 'dup', 'desktop')",
+                (run_id,),
+            )
+        DatabaseManager(dm.db_name).close()
+        with sqlite3.connect(dm.db_name) as conn:
+            rows = conn.execute(
+                "SELECT course_name, price FROM courses ORDER BY id"
+            ).fetchall()
+            indexes = {r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index'"
+            )}
+        assert rows == [("Test Course", "₹1,000"), ("Other", "₹1,000")]
+        assert "ux_courses_dedup" in indexes
+
+    def test_close_releases_connection(self, dm):
+        dm.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            dm.create_run()
+
     def test_reinitialising_does_not_destroy_data(self, dm):
         """Calling _init_db again (CREATE TABLE IF NOT EXISTS) must not lose data."""
         run_id = dm.create_run()
@@ -229,6 +272,70 @@ class TestSaveBatch:
             ).fetchone()[0]
         assert count == 0
 
+    def test_duplicate_course_in_same_run_ignored(self, dm):
+        run_id = dm.create_run()
+        dm.save_batch([_clean_course()], run_id)
+        dm.save_batch([_clean_course(), _clean_course()], run_id)
+        with sqlite3.connect(dm.db_name) as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM courses WHERE run_id=?", (run_id,)
+            ).fetchone()[0]
+        assert count == 1
+
+    def test_logged_count_excludes_ignored_duplicates(self, dm, caplog):
+        run_id = dm.create_run()
+        dm.save_batch([_clean_course()], run_id)
+        with caplog.at_level(logging.DEBUG):
+            dm.save_batch([_clean_course(), _clean_course(course_name="New")], run_id)
+        assert "Saved 1 courses" in caplog.text
+
+    def test_same_course_saved_again_in_new_run(self, dm):
+        run1 = dm.create_run()
+        run2 = dm.create_run()
+        dm.save_batch([_clean_course()], run1)
+        dm.save_batch([_clean_course()], run2)
+        with sqlite3.connect(dm.db_name) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+        assert count == 2
+
+    def test_same_course_kept_per_viewport(self, dm):
+        run_id = dm.create_run()
+        dm.save_batch(
+            [_clean_course(viewport="desktop"), _clean_course(viewport="mobile")],
+            run_id,
+        )
+        with sqlite3.connect(dm.db_name) as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM courses WHERE run_id=?", (run_id,)
+            ).fetchone()[0]
+        assert count == 2
+
+    def test_failed_batch_is_rolled_back(self, dm):
+        run_id = dm.create_run()
+        bad = _clean_course(course_name="Bad", price=object())  # unbindable
+        with pytest.raises(sqlite3.Error):
+            dm.save_batch([_clean_course(), bad], run_id)
+        with sqlite3.connect(dm.db_name) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+        assert count == 0
+
+    def test_concurrent_batches_from_threads(self, dm):
+        """desktop and mobile threads share the manager's single connection."""
+        run_id = dm.create_run()
+
+        def worker(vp):
+            for i in range(20):
+                dm.save_batch([_clean_course(viewport=vp, course_name=f"C{i}")], run_id)
+
+        threads = [threading.Thread(target=worker, args=(vp,)) for vp in ("desktop", "mobile")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        with sqlite3.connect(dm.db_name) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+        assert count == 40
+
     def test_run_id_is_tagged_on_course(self, dm):
         run_id = dm.create_run()
         dm.save_batch([_clean_course()], run_id)
@@ -317,3 +424,154 @@ class TestGetUrlStats:
         stats = dm.get_url_stats("https://nonexistent.com", run_id, "desktop")
         assert stats["cards"] == 0
         assert stats["issues"] == 0
+
+
+# ---------------------------------------------------------------------------
+# begin / flush (deferred commits)
+# ---------------------------------------------------------------------------
+
+def _committed_count(db_name):
+    with sqlite3.connect(db_name) as conn:
+        return conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+
+
+class TestDeferredCommit:
+    def test_rows_not_committed_until_flush(self, dm):
+        dm.begin()
+        dm.save_batch([_clean_course()], dm.create_run())
+        assert _committed_count(dm.db_name) == 0
+        dm.flush()
+        assert _committed_count(dm.db_name) == 1
+
+    def test_auto_flush_after_threshold(self, dm):
+        dm.FLUSH_EVERY_ROWS = 2
+        dm.begin()
+        run_id = dm.create_run()
+        dm.save_batch([_clean_course(course_name="A")], run_id)
+        assert _committed_count(dm.db_name) == 0
+        dm.save_batch([_clean_course(course_name="B")], run_id)
+        assert _committed_count(dm.db_name) == 2
+
+    def test_close_commits_pending_rows(self, tmp_path):
+        db = DatabaseManager(db_name=str(tmp_path / "deferred.db"))
+        db.begin()
+        db.save_batch([_clean_course()], db.create_run())
+        db.close()
+        assert _committed_count(db.db_name) == 1
+
+    def test_failed_batch_keeps_earlier_pending_rows(self, dm):
+        dm.begin()
+        run_id = dm.create_run()
+        dm.save_batch([_clean_course(course_name="A")], run_id)
+        with pytest.raises(sqlite3.Error):
+            dm.save_batch([_clean_course(course_name="B", price=object())], run_id)
+        dm.flush()
+        with sqlite3.connect(dm.db_name) as conn:
+            names = [r[0] for r in conn.execute("SELECT course_name FROM courses")]
+        assert names == ["A"]
+
+    def test_pending_rows_visible_to_url_stats(self, dm):
+        dm.begin()
+        run_id = dm.create_run()
+        dm.save_batch([_clean_course()], run_id)
+        assert dm.get_url_stats("https://example.com/plp", run_id, "desktop")["cards"] == 1
+
+
+# ---------------------------------------------------------------------------
+# delete_url_rows
+# ---------------------------------------------------------------------------
+
+class TestDeleteUrlRows:
+    def test_deletes_only_matching_run_viewport_and_urls(self, dm):
+        run1 = dm.create_run()
+        run2 = dm.create_run()
+        dm.save_batch([
+            _clean_course(course_name="A"),
+            _clean_course(course_name="B", viewport="mobile"),
+            _clean_course(course_name="C", base_url="https://example.com/other"),
+        ], run1)
+        dm.save_batch([_clean_course(course_name="A")], run2)
+        assert dm.delete_url_rows(run1, "desktop", ["https://example.com/plp"]) == 1
+        with sqlite3.connect(dm.db_name) as conn:
+            left = conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+        assert left == 3
+
+    def test_empty_url_list_is_a_no_op(self, dm):
+        assert dm.delete_url_rows(dm.create_run(), "desktop", []) == 0
+
+
+# ---------------------------------------------------------------------------
+# get_seen_courses
+# ---------------------------------------------------------------------------
+
+class TestGetSeenCourses:
+    def test_returns_latest_result_from_earlier_runs(self, dm):
+        dm.save_batch([_clean_course(course_name="A", is_broken=1)], dm.create_run())
+        dm.save_batch([_clean_course(course_name="A"), _clean_course(course_name="B")],
+                      dm.create_run())
+        current = dm.create_run()
+        link = _clean_course()["cta_link"]
+        assert dm.get_seen_courses("https://example.com/plp", "desktop", current) == {
+            ("A", link, "₹1,000"): ("₹1,000", "Found (Enroll Now)", 0, 0),
+            ("B", link, "₹1,000"): ("₹1,000", "Found (Enroll Now)", 0, 0),
+        }
+
+    def test_excludes_current_run(self, dm):
+        run_id = dm.create_run()
+        dm.save_batch([_clean_course()], run_id)
+        assert dm.get_seen_courses("https://example.com/plp", "desktop", run_id) == {}
+
+    def test_scoped_to_url_and_viewport(self, dm):
+        dm.save_batch([
+            _clean_course(course_name="Mobile", viewport="mobile"),
+            _clean_course(course_name="Other", base_url="https://example.com/other"),
+        ], dm.create_run())
+        current = dm.create_run()
+        assert dm.get_seen_courses("https://example.com/plp", "desktop", current) == {}
+
+
+# ---------------------------------------------------------------------------
+# connect
+# ---------------------------------------------------------------------------
+
+class TestConnect:
+    def test_applies_connection_pragmas(self, dm):
+        conn = connect(dm.db_name)
+        try:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2   # MEMORY
+        finally:
+            conn.close()
+
+
+# ---------------------------------------------------------------------------
+# connect_read_only
+# ---------------------------------------------------------------------------
+
+class TestConnectReadOnly:
+    def test_reads_committed_rows(self, dm):
+        run_id = dm.create_run()
+        dm.save_batch([_clean_course()], run_id)
+        conn = connect_read_only(dm.db_name)
+        try:
+            count = conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+        finally:
+            conn.close()
+        assert count == 1
+
+    def test_rejects_writes(self, dm):
+        conn = connect_read_only(dm.db_name)
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO runs (mode) VALUES ('guest')")
+        finally:
+            conn.close()
+
+    def test_applies_read_pragmas(self, dm):
+        conn = connect_read_only(dm.db_name)
+        try:
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2   # MEMORY
+        finally:
+            conn.close()
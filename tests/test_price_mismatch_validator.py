@@ -132,6 +132,10 @@ class TestMismatchDetection:
         # "₹1,299" vs "1299" should be equal after cleaning
         assert validate({"price": "₹1,299", "pdp_price": "1299"}) == []
 
+    def test_leading_zero_same_value_no_issues(self):
+        # Compared by value, so a zero-padded price is not a mismatch
+        assert validate({"price": "₹093,500", "pdp_price": "₹93,500"}) == []
+
     def test_mismatched_prices_raises_issue(self):
         issues = validate({"price": "₹1,000", "pdp_price": "₹2,000"})
         assert len(issues) == 1
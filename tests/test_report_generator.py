@@ -9,7 +9,9 @@ Covers:
 - _section_details: no-issues message, course names, pipe escaping, grouping
 - _query_db_stats: viewport grouping, field accuracy, empty DB
 """
+import io
 import os
+import sqlite3
 import pytest
 from datetime import datetime, timedelta
 from validators import ValidationResult
@@ -23,6 +25,13 @@ import report_generator as rg_module
 # Fixtures
 # ---------------------------------------------------------------------------
 
+def _render(section, *args) -> str:
+    """Run a _section_* writer against a fresh buffer and return its text."""
+    buf = io.StringIO()
+    section(buf, *args)
+    return buf.getvalue()
+
+
 @pytest.fixture
 def report_env(tmp_path, monkeypatch):
     """DB + ValidationService + ReportGenerator, pointing reports at tmp_path."""
@@ -139,24 +148,24 @@ class TestSave:
 class TestSectionHeader:
     def test_contains_title(self, report_env):
         gen, _ = report_env
-        assert "WatchDog Run Report" in gen._section_header("5m 30s")
+        assert "WatchDog Run Report" in _render(gen._section_header, "5m 30s")
 
     def test_contains_duration_string(self, report_env):
         gen, _ = report_env
-        assert "5m 30s" in gen._section_header("5m 30s")
+        assert "5m 30s" in _render(gen._section_header, "5m 30s")
 
     def test_contains_url_count(self, report_env):
         gen, _ = report_env
-        section = gen._section_header("1m 0s")
+        section = _render(gen._section_header, "1m 0s")
         assert "1" in section  # 1 URL scraped
 
     def test_lists_scraped_url(self, report_env):
         gen, _ = report_env
-        assert "https://example.com/plp" in gen._section_header("1m 0s")
+        assert "https://example.com/plp" in _render(gen._section_header, "1m 0s")
 
     def test_contains_date(self, report_env):
         gen, _ = report_env
-        assert "2024-01-15" in gen._section_header("0m 0s")
+        assert "2024-01-15" in _render(gen._section_header, "0m 0s")
 
 
 # ---------------------------------------------------------------------------
@@ -166,22 +175,22 @@ class TestSectionHeader:
 class TestSectionUrlSummary:
     def test_no_issues_shows_clean_message(self, report_env):
         gen, _ = report_env
-        assert "No errors found" in gen._section_url_summary([])
+        assert "No errors found" in _render(gen._section_url_summary, [])
 
     def test_issues_shows_table_header(self, report_env):
         gen, _ = report_env
-        section = gen._section_url_summary(gen.vs.validation_results)
+        section = _render(gen._section_url_summary, gen.vs.validation_results)
         assert "URL" in section
         assert "Issue Count" in section
 
     def test_issues_shows_base_url(self, report_env):
         gen, _ = report_env
-        section = gen._section_url_summary(gen.vs.validation_results)
+        section = _render(gen._section_url_summary, gen.vs.validation_results)
         assert "https://example.com/plp" in section
 
     def test_issues_shows_bold_count(self, report_env):
         gen, _ = report_env
-        section = gen._section_url_summary(gen.vs.validation_results)
+        section = _render(gen._section_url_summary, gen.vs.validation_results)
         assert "**" in section
 
     def test_sorted_descending_by_count(self, report_env):
@@ -193,7 +202,7 @@ class TestSectionUrlSummary:
             ValidationResult("CTA_BROKEN", "CRITICAL", "msg", "C", base_url="https://a.com"),
             ValidationResult("PRICE_MISMATCH", "MEDIUM", "msg", "C", base_url="https://b.com"),
         ]
-        section = gen._section_url_summary(issues)
+        section = _render(gen._section_url_summary, issues)
         pos_a = section.find("https://a.com")
         pos_b = section.find("https://b.com")
         assert pos_a < pos_b  # a.com has 2 issues → appears first
@@ -206,31 +215,41 @@ class TestSectionUrlSummary:
 class TestSectionIssueBreakdown:
     def test_no_issues_shows_clean_message(self, report_env):
         gen, _ = report_env
-        section = gen._section_issue_breakdown({"total_issues": 0, "by_type": {}, "by_severity": {}})
+        section = _render(gen._section_issue_breakdown, {"total_issues": 0, "by_type": {}, "by_severity": {}})
         assert "No issues found" in section
 
     def test_shows_cta_broken_type(self, report_env):
         gen, _ = report_env
         summary = gen.vs.get_summary()
-        assert "CTA_BROKEN" in gen._section_issue_breakdown(summary)
+        assert "CTA_BROKEN" in _render(gen._section_issue_breakdown, summary)
 
     def test_shows_price_mismatch_type(self, report_env):
         gen, _ = report_env
         summary = gen.vs.get_summary()
-        assert "PRICE_MISMATCH" in gen._section_issue_breakdown(summary)
+        assert "PRICE_MISMATCH" in _render(gen._section_issue_breakdown, summary)
 
     def test_shows_critical_severity(self, report_env):
         gen, _ = report_env
         summary = gen.vs.get_summary()
-        assert "CRITICAL" in gen._section_issue_breakdown(summary)
+        assert "CRITICAL" in _render(gen._section_issue_breakdown, summary)
 
     def test_shows_total_count(self, report_env):
         gen, _ = report_env
         summary = gen.vs.get_summary()
-        section = gen._section_issue_breakdown(summary)
+        section = _render(gen._section_issue_breakdown, summary)
         total = str(summary["total_issues"])
         assert total in section
 
+    def test_known_types_listed_before_unknown(self, report_env):
+        gen, _ = report_env
+        summary = {
+            "total_issues": 3,
+            "by_type": {"ZZ_CUSTOM": 1, "PRICE_MISMATCH": 1, "CTA_BROKEN": 1},
+            "by_severity": {},
+        }
+        section = _render(gen._section_issue_breakdown, summary)
+        assert section.index("CTA_BROKEN") < section.index("PRICE_MISMATCH") < section.index("ZZ_CUSTOM")
+
 
 # ---------------------------------------------------------------------------
 # _section_details
@@ -239,11 +258,11 @@ class TestSectionIssueBreakdown:
 class TestSectionDetails:
     def test_no_issues_shows_clean_message(self, report_env):
         gen, _ = report_env
-        assert "No issues to report" in gen._section_details([])
+        assert "No issues to report" in _render(gen._section_details, [])
 
     def test_shows_course_name(self, report_env):
         gen, _ = report_env
-        section = gen._section_details(gen.vs.validation_results)
+        section = _render(gen._section_details, gen.vs.validation_results)
         assert "Broken Course" in section
 
     def test_pipe_chars_escaped_in_expected_field(self, report_env):
@@ -257,7 +276,7 @@ class TestSectionDetails:
             expected="https://example.com?a=1|b=2",
             actual="N/A",
         )
-        section = gen._section_details([issue])
+        section = _render(gen._section_details, [issue])
         assert "\\|" in section
 
     def test_pipe_chars_escaped_in_actual_field(self, report_env):
@@ -271,23 +290,23 @@ class TestSectionDetails:
             expected="Valid URL",
             actual="https://example.com?a=1|b=2",
         )
-        section = gen._section_details([issue])
+        section = _render(gen._section_details, [issue])
         assert "\\|" in section
 
     def test_groups_by_issue_type(self, report_env):
         gen, _ = report_env
-        section = gen._section_details(gen.vs.validation_results)
+        section = _render(gen._section_details, gen.vs.validation_results)
         # Different issue types should have their own ### subsections
         assert section.count("###") >= 1
 
     def test_includes_viewport_column(self, report_env):
         gen, _ = report_env
-        section = gen._section_details(gen.vs.validation_results)
+        section = _render(gen._section_details, gen.vs.validation_results)
         assert "Viewport" in section
 
     def test_includes_url_column(self, report_env):
         gen, _ = report_env
-        section = gen._section_details(gen.vs.validation_results)
+        section = _render(gen._section_details, gen.vs.validation_results)
         assert "URL" in section
 
 
@@ -361,6 +380,19 @@ class TestQueryDbStats:
         # run2 has no courses, so stats should be empty
         assert gen._query_db_stats() == {}
 
+    def test_not_blocked_by_open_write_transaction(self, report_env):
+        """WAL readers see the committed snapshot while a writer holds the lock."""
+        gen, _ = report_env
+        writer = sqlite3.connect(gen.db_name, isolation_level=None)
+        try:
+            writer.execute("BEGIN IMMEDIATE")
+            writer.execute("DELETE FROM courses")
+            stats = gen._query_db_stats()
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+        assert stats["desktop"]["courses"] == 2
+
 
 # ---------------------------------------------------------------------------
 # Phase 2 — guest vs authenticated report filenames
@@ -423,3 +455,32 @@ class TestReportFilenameModeProfile:
         )
         path = gen.save()
         assert path.endswith("_auth_NEET.md")
+
+
+# ---------------------------------------------------------------------------
+# db_stats (cached per instance)
+# ---------------------------------------------------------------------------
+
+class TestDbStatsCache:
+    def test_db_stats_matches_query(self, report_env):
+        gen, _ = report_env
+        assert gen.db_stats == gen._query_db_stats()
+
+    def test_db_stats_queried_once(self, report_env, monkeypatch):
+        gen, _ = report_env
+        calls = []
+        real = gen._query_db_stats
+        monkeypatch.setattr(gen, "_query_db_stats", lambda: calls.append(1) or real())
+        gen.build_markdown()
+        gen.build_markdown()
+        assert len(calls) == 1
+
+    def test_empty_run_skips_db_query(self, empty_report_env, monkeypatch):
+        gen, _ = empty_report_env
+        gen.urls_scraped = []
+        calls = []
+        monkeypatch.setattr(gen, "_query_db_stats", lambda: calls.append(1) or {})
+        md = gen.build_markdown()
+        assert calls == []
+        assert "No URLs were scraped" in md
+        assert "Summary" not in md
@@ -5,12 +5,20 @@ Covers:
 - BasePageHandler.clean_price: currency symbols, commas, N/A sentinels, edge cases
 - PdpCache: get/set, viewport isolation, size, overwrite, thread safety
 - ProgressTracker: counter increments, label formatting, padding, thread safety
+- BasePageHandler.discover_tabs: trimming, de-duplication, nth() pinning
+- NetworkCache: get/set, size cap
+- Request routing filter: blocked resource types and analytics hosts,
+  immutable-asset caching
 """
+import re
 import threading
 import pytest
 from unittest.mock import MagicMock
-from cache import PdpCache, ProgressTracker
-from handlers import BasePageHandler
+from cache import NetworkCache, PdpCache, ProgressTracker
+from database import DatabaseManager
+from validation_service import ValidationService
+import handlers
+from handlers import BasePageHandler, _route_filter, install_request_routing
 
 
 # ---------------------------------------------------------------------------
@@ -53,6 +61,9 @@ class TestCleanPrice:
     def test_large_indian_price_format(self):
         assert self.h.clean_price("₹1,00,000") == "100000"
 
+    def test_trailing_text_falls_back_to_digit_scan(self):
+        assert self.h.clean_price("₹1,299/-") == "1299"
+
     def test_none_returns_none(self):
         assert self.h.clean_price(None) is None
 
@@ -84,6 +95,229 @@ class TestCleanPrice:
         assert desktop_h.clean_price("₹5,000") == mobile_h.clean_price("₹5,000")
 
 
+# ---------------------------------------------------------------------------
+# discover_tabs
+# ---------------------------------------------------------------------------
+
+class TestDiscoverTabs:
+    def test_returns_unique_trimmed_labels_with_pinned_locators(self):
+        h = make_handler()
+        loc = h.page.locator.return_value.filter.return_value
+        loc.all_inner_texts.return_value = [" JEE ", "NEET", "JEE", ""]
+        tabs = h.discover_tabs("button", re.compile(r"^(JEE|NEET)$"))
+        assert [text for _, text in tabs] == ["JEE", "NEET"]
+        loc.nth.assert_any_call(0)
+        loc.nth.assert_any_call(1)
+
+    def test_no_matches_returns_empty_list(self):
+        h = make_handler()
+        h.page.locator.return_value.filter.return_value.all_inner_texts.return_value = []
+        assert h.discover_tabs("button", re.compile("x")) == []
+
+
+class TestExtractCtaLink:
+    def test_relative_href_is_made_absolute_without_clicking(self):
+        h = make_handler()
+        card = MagicMock()
+        card.evaluate.return_value = "/course/jee-nurture"
+        assert h.extract_cta_link(card) == "https://allen.in/course/jee-nurture"
+        card.evaluate.assert_called_once()
+        card.locator.assert_not_called()
+
+    def test_absolute_href_returned_as_is(self):
+        h = make_handler()
+        card = MagicMock()
+        card.evaluate.return_value = "https://example.com/pdp"
+        assert h.extract_cta_link(card) == "https://example.com/pdp"
+
+
+class TestCardRecords:
+    def test_reads_all_cards_in_one_evaluate_all(self):
+        h = make_handler()
+        cards = MagicMock()
+        cards.evaluate_all.return_value = [{"name": "A", "price": "₹1", "href": "/a"}]
+        assert h.card_records(cards, ["h2"], ["h3"])[0]["name"] == "A"
+        assert cards.evaluate_all.call_args.args[1] == [["h2"], ["h3"]]
+
+    def test_card_link_uses_href_without_touching_the_page(self):
+        h = make_handler()
+        card, tab = MagicMock(), MagicMock()
+        link = h._card_link({"href": "/a"}, card, tab, "JEE")
+        assert link == "https://allen.in/a"
+        card.evaluate.assert_not_called()
+        tab.evaluate.assert_not_called()
+
+    def test_card_link_without_href_falls_back_to_the_card(self):
+        h = make_handler()
+        card = MagicMock()
+        card.evaluate.return_value = "/from-card"
+        assert h._card_link({"href": None}, card, None, "JEE") == "https://allen.in/from-card"
+
+
+def make_pdp_page():
+    pdp_page = MagicMock()
+    pdp_page.goto.return_value.status = 200
+    pdp_page.content.return_value = "<html></html>"
+    pdp_page.url = "https://allen.in/pdp"
+    return pdp_page
+
+
+class TestVerifyPdpPage:
+    def test_uses_pdp_page_and_leaves_listing_untouched(self):
+        pdp_page = make_pdp_page()
+        pdp_page.wait_for_function.return_value.json_value.return_value = ["₹1,000", "Enroll Now"]
+        h = ConcreteHandler(MagicMock(), MagicMock(), pdp_page=pdp_page)
+        result = h.verify_pdp("https://allen.in/pdp", "https://allen.in", "₹1,000")
+        assert result == ("₹1,000", "Found (Enroll Now)", 0, 0)
+        pdp_page.goto.assert_called_once()
+        h.page.goto.assert_not_called()
+
+    def test_timeout_falls_back_to_partial_scan(self):
+        pdp_page = make_pdp_page()
+        pdp_page.wait_for_function.side_effect = TimeoutError("no CTA")
+        pdp_page.evaluate.return_value = ["₹1,200", None]
+        h = ConcreteHandler(MagicMock(), MagicMock(), pdp_page=pdp_page)
+        result = h.verify_pdp("https://allen.in/pdp", "https://allen.in", "₹1,000")
+        assert result == ("₹1,200", "Not Found", 0, 1)
+
+
+class TestVerifyCards:
+    def test_builds_rows_without_touching_the_listing(self):
+        h = make_handler()
+        calls = []
+
+        def fake_verify(link, url, card_price):
+            calls.append(link)
+            return "₹1", "Found (Enroll Now)", 0, 0
+
+        h.verify_pdp = fake_verify
+        rows = h._verify_cards([("A", "₹1", "/a"), ("B", "₹1", "/b")], "https://allen.in")
+        assert calls == ["/a", "/b"]
+        assert [r["course_name"] for r in rows] == ["A", "B"]
+        assert rows[0]["viewport"] == h.viewport
+        h.page.goto.assert_not_called()
+
+    def test_seen_cards_copy_the_earlier_result_forward(self):
+        h = make_handler()
+        h.verify_pdp = MagicMock(return_value=("₹1", "Found (Buy Now)", 0, 0))
+        rows = h._verify_cards(
+            [("A", "₹1", "/a"), ("A", "₹1", "/a-new"), ("B", "₹2", "/b")],
+            "https://allen.in",
+            {("A", "/a", "₹1"): ("N/A", "N/A", 1, 0), ("B", "/b", "₹1"): ("₹1", "N/A", 0, 0)},
+        )
+        assert [r["cta_link"] for r in rows] == ["/a", "/a-new", "/b"]
+        assert (rows[0]["is_broken"], rows[0]["cta_status"]) == (1, "N/A")
+        # B's listed price changed since the earlier run, so it is re-verified
+        assert [c.args[0] for c in h.verify_pdp.call_args_list] == ["/a-new", "/b"]
+
+    def test_recheck_with_incremental_keeps_real_failures(self, monkeypatch, tmp_path):
+        """Earlier runs must not let a re-check report a real failure as cleared."""
+        monkeypatch.setattr(handlers, "WATCHDOG_INCREMENTAL", True)
+        url, card = "https://allen.in/plp", ("Course", "₹1", "https://allen.in/c")
+        dm = DatabaseManager(str(tmp_path / "inc.db"))
+        broken = ("N/A", "N/A", 1, 0)
+
+        def scrape(run_id, incremental):
+            h = ConcreteHandler(MagicMock(), dm, run_id=run_id, incremental=incremental)
+            h.verify_pdp = MagicMock(return_value=broken)
+            dm.save_batch(h._verify_cards([card], url, h._already_scraped(url)), run_id)
+            return h.verify_pdp
+
+        def broken_count(run_id):
+            vs = ValidationService(dm.db_name)
+            try:
+                vs.validate_all_courses(run_id=run_id)
+                return len(vs.get_issues_by_type("CTA_BROKEN"))
+            finally:
+                vs.close()
+
+        scrape(dm.create_run(), incremental=True)          # earlier run
+        run_id = dm.create_run()
+        assert not scrape(run_id, incremental=True).called  # copied forward
+        assert broken_count(run_id) == 1
+
+        # Re-check: first-pass rows are deleted, then the URL is re-scraped
+        dm.delete_url_rows(run_id, "desktop", [url])
+        assert scrape(run_id, incremental=False).called
+        assert broken_count(run_id) == 1
+        dm.close()
+
+    def test_incremental_off_ignores_earlier_runs(self, monkeypatch):
+        monkeypatch.setattr(handlers, "WATCHDOG_INCREMENTAL", True)
+        h = ConcreteHandler(MagicMock(), MagicMock(), run_id=2, incremental=False)
+        assert h._already_scraped("https://allen.in") == {}
+        h.db.get_seen_courses.assert_not_called()
+        h.incremental = True
+        h._already_scraped("https://allen.in")
+        h.db.get_seen_courses.assert_called_once_with("https://allen.in", "desktop", 2)
+
+    def test_pdp_page_defaults_to_a_new_page_in_the_listing_context(self):
+        h = make_handler()
+        assert h.pdp_page is h.page.context.new_page.return_value
+
+    def test_close_closes_only_an_owned_pdp_page(self):
+        h = make_handler()
+        h.close()
+        h.pdp_page.close.assert_called_once()
+        h.close()
+        h.pdp_page.close.assert_called_once()
+
+        pdp_page = make_pdp_page()
+        ConcreteHandler(MagicMock(), MagicMock(), pdp_page=pdp_page).close()
+        pdp_page.close.assert_not_called()
+
+
+class TestEnvRegex:
+    def test_compiled_once_from_env(self, monkeypatch):
+        monkeypatch.setenv("WATCHDOG_TEST_API_RE", r"/api/v\d+/courses")
+        pattern = handlers._env_regex("WATCHDOG_TEST_API_RE")
+        assert pattern.search("https://allen.in/api/v2/courses?x=1")
+
+    def test_unset_or_invalid_is_none(self, monkeypatch):
+        monkeypatch.delenv("WATCHDOG_TEST_API_RE", raising=False)
+        assert handlers._env_regex("WATCHDOG_TEST_API_RE") is None
+        monkeypatch.setenv("WATCHDOG_TEST_API_RE", "(")
+        assert handlers._env_regex("WATCHDOG_TEST_API_RE") is None
+
+
+class TestClickTab:
+    def test_waits_for_cards_to_change_with_configured_cap(self, monkeypatch):
+        monkeypatch.setattr(handlers, "WATCHDOG_SETTLE_MS", 1234)
+        h = make_handler()
+        h.page.evaluate.return_value = "3|A|C"
+        tab = MagicMock()
+        h._click_tab(tab)
+        tab.evaluate.assert_called_once_with("el => el.click()")
+        h.page.evaluate.assert_called_once_with(handlers._CARD_SIGNATURE_JS, "li")
+        h.page.wait_for_function.assert_called_once_with(
+            handlers._CARDS_CHANGED_JS, arg=["li", "3|A|C"], timeout=1234, polling=100
+        )
+        h.page.wait_for_load_state.assert_not_called()
+
+    def test_timeout_is_swallowed(self):
+        h = make_handler()
+        h.page.wait_for_function.side_effect = TimeoutError("unchanged")
+        h._click_tab(MagicMock(), 10)  # must not raise
+
+    def test_falls_back_to_fixed_wait_without_signature(self):
+        h = make_handler()
+        h.page.evaluate.side_effect = RuntimeError("detached")
+        h._click_tab(MagicMock(), 10)
+        h.page.wait_for_timeout.assert_called_once_with(10)
+        h.page.wait_for_function.assert_not_called()
+
+
+class TestSafeGetText:
+    def test_scans_selectors_in_one_evaluate(self):
+        h = make_handler()
+        card = MagicMock()
+        card.evaluate.return_value = "JEE Nurture"
+        assert h.safe_get_text(card, ["h2", "p"]) == "JEE Nurture"
+        card.evaluate.assert_called_once()
+        assert card.evaluate.call_args.args[1] == ["h2", "p"]
+        card.locator.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # PdpCache
 # ---------------------------------------------------------------------------
@@ -226,3 +460,116 @@ class TestProgressTracker:
 
         assert len(results) == 100
         assert len(set(results)) == 100  # every result must be unique
+
+
+# ---------------------------------------------------------------------------
+# Request blocking
+# ---------------------------------------------------------------------------
+
+def make_route(resource_type="document", url="https://allen.in/"):
+    route = MagicMock()
+    route.request.resource_type = resource_type
+    route.request.url = url
+    return route
+
+
+class TestRouteFilter:
+    def test_routing_installed_once_on_a_context(self):
+        context = MagicMock()
+        install_request_routing(context, NetworkCache())
+        context.route.assert_called_once()
+        assert context.route.call_args.args[0] == "**/*"
+
+    @pytest.mark.parametrize("resource_type", ["image", "font", "media"])
+    def test_heavy_resources_aborted(self, resource_type):
+        route = make_route(resource_type=resource_type)
+        _route_filter(route)
+        route.abort.assert_called_once()
+        route.continue_.assert_not_called()
+
+    def test_analytics_host_aborted(self):
+        route = make_route(resource_type="script", url="https://www.googletagmanager.com/gtm.js")
+        _route_filter(route)
+        route.abort.assert_called_once()
+
+    @pytest.mark.parametrize("resource_type", ["document", "script", "xhr", "fetch"])
+    def test_page_resources_continue(self, resource_type):
+        route = make_route(resource_type=resource_type)
+        _route_filter(route)
+        route.continue_.assert_called_once()
+        route.abort.assert_not_called()
+
+    def test_stylesheets_continue_by_default(self):
+        route = make_route(resource_type="stylesheet")
+        _route_filter(route)
+        route.continue_.assert_called_once()
+
+    def test_cached_asset_fulfilled_without_fetch(self):
+        cache = NetworkCache()
+        cache.set("https://allen.in/_next/a.js", 200, {"content-type": "text/javascript"}, b"js")
+        route = make_route(resource_type="script", url="https://allen.in/_next/a.js")
+        route.request.method = "GET"
+        _route_filter(route, cache)
+        route.fetch.assert_not_called()
+        route.fulfill.assert_called_once_with(
+            status=200, headers={"content-type": "text/javascript"}, body=b"js"
+        )
+
+    def test_immutable_asset_stored_after_fetch(self):
+        cache = NetworkCache()
+        route = make_route(resource_type="script", url="https://allen.in/_next/b.js")
+        route.request.method = "GET"
+        response = route.fetch.return_value
+        response.ok = True
+        response.status = 200
+        response.headers = {"cache-control": "public, max-age=31536000, immutable"}
+        response.body.return_value = b"bundle"
+        _route_filter(route, cache)
+        assert cache.get("https://allen.in/_next/b.js") == (200, response.headers, b"bundle")
+
+    def test_stored_asset_drops_encoding_headers(self):
+        cache = NetworkCache()
+        route = make_route(resource_type="stylesheet", url="https://allen.in/_next/c.css")
+        route.request.method = "GET"
+        response = route.fetch.return_value
+        response.ok = True
+        response.status = 200
+        response.headers = {
+            "cache-control": "immutable",
+            "content-encoding": "br",
+            "content-length": "10",
+        }
+        response.body.return_value = b"css"
+        _route_filter(route, cache)
+        assert cache.get("https://allen.in/_next/c.css")[1] == {"cache-control": "immutable"}
+
+    def test_mutable_asset_not_stored(self):
+        cache = NetworkCache()
+        route = make_route(resource_type="script", url="https://allen.in/app.js")
+        route.request.method = "GET"
+        response = route.fetch.return_value
+        response.ok = True
+        response.headers = {"cache-control": "no-cache"}
+        response.body.return_value = b"app"
+        _route_filter(route, cache)
+        assert cache.size() == 0
+
+
+# ---------------------------------------------------------------------------
+# NetworkCache
+# ---------------------------------------------------------------------------
+
+class TestNetworkCache:
+    def test_get_on_empty_cache_returns_none(self):
+        assert NetworkCache().get("https://allen.in/a.js") is None
+
+    def test_set_then_get_returns_stored_value(self):
+        cache = NetworkCache()
+        cache.set("https://allen.in/a.js", 200, {}, b"x")
+        assert cache.get("https://allen.in/a.js") == (200, {}, b"x")
+
+    def test_size_cap_rejects_oversized_entries(self):
+        cache = NetworkCache(max_bytes=4)
+        assert cache.set("https://allen.in/a.js", 200, {}, b"abc") is True
+        assert cache.set("https://allen.in/b.js", 200, {}, b"de") is False
+        assert cache.size() == 1
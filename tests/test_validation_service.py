@@ -2,9 +2,14 @@
 Tests for ValidationService.
 
 Covers:
-- validate_course: clean course, broken CTA, price mismatch
+- validate_course: clean course, broken CTA, price mismatch,
+  a CRITICAL CTA issue stopping the chain (terminal_severities)
 - validate_all_courses: empty DB, populates results, run_id scoping,
-  viewport stamping from DB row, stores results on instance
+  viewport stamping from DB row, stores results on instance,
+  validate_all_courses_iter streaming in fetch-size chunks, id scan order,
+  connection reuse across scans and close()
+- SQL pre-filter: built from the current chain, same issues as a full scan,
+  a reassigned chain without sql_candidates scans every row
 - get_summary: empty, counts by type, counts by severity
 - get_issues_by_severity / get_issues_by_type: filtering and empty cases
 - log_results: deduplication by (course_name, type, viewport)
@@ -13,6 +18,7 @@ import logging
 import pytest
 from database import DatabaseManager
 from validation_service import ValidationService
+from validators import BaseValidator, ValidationResult
 
 
 # ---------------------------------------------------------------------------
@@ -28,6 +34,18 @@ def _make_vs_no_db():
     return vs
 
 
+class _NoOpValidator(BaseValidator):
+    """Flags nothing; has no sql_candidates."""
+    def _validate(self, course_data):
+        return []
+
+
+class _FlagEveryRowValidator(BaseValidator):
+    """Flags every row it sees; has no sql_candidates."""
+    def _validate(self, course_data):
+        return [ValidationResult("SEEN", "LOW", "seen", course_data["course_name"])]
+
+
 @pytest.fixture
 def populated_db(tmp_path):
     """DB pre-seeded with one run containing 4 diverse courses."""
@@ -142,6 +160,27 @@ class TestValidateCourse:
         })
         assert any(i.severity == "HIGH" and i.type == "CTA_MISSING" for i in issues)
 
+    BROKEN_AND_MISMATCHED = {
+        "course_name": "Both",
+        "cta_link": "https://example.com",
+        "is_broken": 1,
+        "price": "₹1,000",
+        "pdp_price": "₹2,000",
+        "viewport": "desktop",
+        "base_url": "https://example.com",
+    }
+
+    def test_default_chain_stops_after_critical(self):
+        vs = _make_vs_no_db()
+        types = {i.type for i in vs.validate_course(self.BROKEN_AND_MISMATCHED)}
+        assert types == {"CTA_BROKEN"}
+
+    def test_empty_terminal_severities_continues_chain(self):
+        vs = _make_vs_no_db()
+        vs.validator_chain.terminal_severities = frozenset()
+        types = {i.type for i in vs.validate_course(self.BROKEN_AND_MISMATCHED)}
+        assert types == {"CTA_BROKEN", "PRICE_MISMATCH"}
+
 
 # ---------------------------------------------------------------------------
 # validate_all_courses
@@ -209,6 +248,52 @@ class TestValidateAllCourses:
         results = vs.validate_all_courses(run_id=run_id)
         assert vs.validation_results is results
 
+    def test_reuses_connection_and_sees_new_rows(self, populated_db):
+        db_path, run_id = populated_db
+        vs = ValidationService(db_path)
+        first = len(vs.validate_all_courses(run_id=run_id))
+        conn = vs._conn
+        dm = DatabaseManager(db_path)
+        dm.save_batch([{
+            "base_url": "https://example.com", "course_name": "Late",
+            "cta_link": "N/A", "price": "N/A", "pdp_price": "N/A",
+            "cta_status": "N/A", "is_broken": 1, "viewport": "desktop",
+        }], run_id)
+        dm.close()
+        assert len(vs.validate_all_courses(run_id=run_id)) == first + 1
+        assert vs._conn is conn
+        vs.close()
+        assert vs._conn is None
+        assert len(vs.validate_all_courses(run_id=run_id)) == first + 1
+
+    def test_iter_matches_list_and_spans_fetch_chunks(self, populated_db, monkeypatch):
+        db_path, run_id = populated_db
+        vs = ValidationService(db_path)
+        monkeypatch.setattr(vs, "FETCH_SIZE", 1)
+        streamed = list(vs.validate_all_courses_iter(run_id=run_id))
+        assert streamed == vs.validate_all_courses(run_id=run_id)
+        assert len(streamed) > 1
+
+    def test_issues_follow_insertion_order_across_viewports(self, tmp_path):
+        """Rows are scanned by id, not in report-index (viewport) order."""
+        db_path = str(tmp_path / "order.db")
+        dm = DatabaseManager(db_path)
+        run_id = dm.create_run()
+        bad = {
+            "base_url": "https://example.com", "cta_link": "N/A",
+            "price": "N/A", "pdp_price": "N/A", "cta_status": "N/A",
+            "is_broken": 1, "price_mismatch": 0,
+        }
+        dm.save_batch([
+            {**bad, "course_name": "First", "viewport": "mobile"},
+            {**bad, "course_name": "Second", "viewport": "desktop"},
+            {**bad, "course_name": "Third", "viewport": "mobile"},
+        ], run_id)
+        dm.close()
+        vs = ValidationService(db_path)
+        names = [r.course_name for r in vs.validate_all_courses(run_id=run_id)]
+        assert names == ["First", "Second", "Third"]
+
     def test_no_run_id_validates_all_rows(self, tmp_path):
         """Calling without run_id should validate every course in the DB."""
         db_path = str(tmp_path / "all.db")
@@ -235,6 +320,73 @@ class TestValidateAllCourses:
         assert "Bad2" in course_names
 
 
+class TestSqlPrefilter:
+    EDGE_CASES = [
+        # (course_name, cta_link, price, pdp_price, cta_status, is_broken)
+        ("Clean", "https://example.com/c", "₹1,000", "₹1,000", "Found (Enroll Now)", 0),
+        ("Same digits", "https://example.com/d", "₹1,000", "₹ 1000", "Found (Buy Now)", 0),
+        ("Mismatch", "https://example.com/m", "₹1,000", "₹2,000", "Found (Buy Now)", 0),
+        ("Self link", "https://example.com/", "₹1", "₹1", "Found (Buy Now)", 0),
+        ("No link", "", "N/A", "N/A", "N/A", 0),
+        ("Error link", "Error", "₹1", "₹1", "Error", 0),
+        ("Broken", "https://example.com/b", "₹1", "₹1", "N/A", 1),
+        ("No CTA", "https://example.com/n", "₹1", "₹1", "Not Found", 0),
+        ("PDP missing", "https://example.com/p", "₹1", "Not Found", "Found (Buy Now)", 0),
+        ("PDP sentinel case", "https://example.com/s", "₹1", " not found", "Found (Buy Now)", 0),
+        ("Zero padded", "https://example.com/z", "₹093,500", "₹93,500", "Found (Buy Now)", 0),
+        ("Separators only", "https://example.com/q", "₹1,00,000", "100000", "Found (Buy Now)", 0),
+    ]
+
+    def test_chain_predicate_built_from_validators(self, tmp_path):
+        vs = ValidationService(str(tmp_path / "x.db"))
+        assert "cta_status = 'Not Found'" in vs.sql_prefilter
+        assert "price <> pdp_price" in vs.sql_prefilter
+
+    def test_prefilter_gives_same_issues_as_full_scan(self, tmp_path):
+        db_path = str(tmp_path / "edge.db")
+        dm = DatabaseManager(db_path)
+        run_id = dm.create_run()
+        dm.save_batch([
+            {
+                "base_url": "https://example.com", "course_name": name,
+                "cta_link": link, "price": price, "pdp_price": pdp,
+                "cta_status": status, "is_broken": broken, "viewport": "desktop",
+            }
+            for name, link, price, pdp, status, broken in self.EDGE_CASES
+        ], run_id)
+        filtered = ValidationService(db_path)
+        full = ValidationService(db_path)
+        # A validator without sql_candidates disables the pre-filter
+        full.validator_chain.next_validator.set_next(_NoOpValidator())
+        assert full.sql_prefilter is None
+
+        def key(r):
+            return (r.course_name, r.type, r.severity)
+
+        expected = sorted(map(key, full.validate_all_courses(run_id=run_id)))
+        assert sorted(map(key, filtered.validate_all_courses(run_id=run_id))) == expected
+        assert {name for name, *_ in expected} == {
+            "Mismatch", "Self link", "No link", "Error link", "Broken", "No CTA"
+        }
+
+    def test_reassigned_chain_scans_every_row(self, tmp_path):
+        db_path = str(tmp_path / "swap.db")
+        dm = DatabaseManager(db_path)
+        run_id = dm.create_run()
+        dm.save_batch([
+            {
+                "base_url": "https://example.com", "course_name": name,
+                "cta_link": link, "price": price, "pdp_price": pdp,
+                "cta_status": status, "is_broken": broken, "viewport": "desktop",
+            }
+            for name, link, price, pdp, status, broken in self.EDGE_CASES
+        ], run_id)
+        vs = ValidationService(db_path)
+        vs.validator_chain = _FlagEveryRowValidator()
+        results = vs.validate_all_courses(run_id=run_id)
+        assert {r.course_name for r in results} == {name for name, *_ in self.EDGE_CASES}
+
+
 # ---------------------------------------------------------------------------
 # get_summary
 # ---------------------------------------------------------------------------
@@ -314,6 +466,14 @@ class TestFilterMethods:
         vs.validate_all_courses(run_id=run_id)
         assert vs.get_issues_by_severity("NONEXISTENT") == []
 
+    def test_reassigning_results_refreshes_filters(self, populated_db):
+        db_path, run_id = populated_db
+        vs = ValidationService(db_path)
+        vs.validate_all_courses(run_id=run_id)
+        assert vs.get_issues_by_type("PRICE_MISMATCH")
+        vs.validation_results = []
+        assert vs.get_issues_by_type("PRICE_MISMATCH") == []
+
 
 # ---------------------------------------------------------------------------
 # log_results / deduplication
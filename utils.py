@@ -7,14 +7,21 @@ drifting apart.
 """
 
 import re
+from functools import lru_cache
 from typing import Optional
 
-_MISSING_SENTINELS = {"n/a", "not found", "error", ""}
+_MISSING_SENTINELS = frozenset(("n/a", "not found", "error", ""))
+# The exact spellings the scraper writes, matched before any case folding.
+_MISSING_EXACT = _MISSING_SENTINELS | frozenset(("N/A", "Not Found", "Error"))
+
+_DIGITS_RE = re.compile(r"\d+")
+# Characters stripped by the clean_price fast path ("₹ 93,500" -> "93500").
+_PRICE_STRIP = str.maketrans("", "", ", ₹")
 
 
 def is_price_missing(price_str: Optional[str]) -> bool:
     """Return True if *price_str* represents an absent or unknown price."""
-    if not price_str:
+    if not price_str or price_str in _MISSING_EXACT:
         return True
     return price_str.strip().lower() in _MISSING_SENTINELS
 
@@ -32,5 +39,27 @@ def clean_price(price_str: Optional[str]) -> Optional[str]:
     """
     if is_price_missing(price_str):
         return None
-    nums = "".join(re.findall(r"\d+", str(price_str).replace(",", "")))
+    price_str = str(price_str)
+    # Fast path: the common "₹ 1,299" shape is all digits once separators go.
+    stripped = price_str.translate(_PRICE_STRIP)
+    if stripped.isdecimal():
+        return stripped
+    nums = "".join(_DIGITS_RE.findall(price_str))
     return nums if nums else None
+
+
+@lru_cache(maxsize=4096)
+def price_value(price_str: Optional[str]) -> Optional[int]:
+    """
+    Return the numeric value of a price string, for comparisons.
+
+    Unlike clean_price this compares by value, so leading zeros don't count::
+
+        price_value("₹ 093,500") -> 93500
+        price_value("N/A")       -> None
+
+    A catalogue only has a few distinct price strings, so results are
+    memoised and a validation pass parses each one once.
+    """
+    digits = clean_price(price_str)
+    return int(digits) if digits else None
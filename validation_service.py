@@ -3,22 +3,78 @@ Validation Service
 Orchestrates validation rules and manages validation results.
 """
 
-import sqlite3
 import logging
-from typing import List, Dict, Any, Optional
+from collections import Counter, defaultdict
+from contextlib import closing
+from typing import List, Dict, Any, Iterator, Optional
+from constants import SEV_CRITICAL, SEV_HIGH, SEVERITY_ORDER
+from database import connect_read_only
 from validators import BaseValidator, ValidationResult, PurchaseCTAValidator, PriceMismatchValidator
 
 
+# Only the columns the validator chain reads are fetched.
+_COURSE_COLUMNS = (
+    "course_name", "base_url", "cta_link", "is_broken",
+    "cta_status", "price", "pdp_price", "viewport",
+)
+_SELECT_COURSES = f"SELECT {', '.join(_COURSE_COLUMNS)} FROM courses"
+
+
 class ValidationService:
     """
     Service class that manages validation workflow.
     Builds validator chains and processes validation results.
     """
     
+    # Rows pulled from SQLite per fetchmany() call
+    FETCH_SIZE = 1000
+    # Read-only connection, opened on the first scan and reused until close()
+    _conn = None
+
     def __init__(self, db_name: str = "scraped_data.db"):
         self.db_name = db_name
         self.validator_chain = self._build_default_validator_chain()
         self.validation_results = []
+
+    def _connection(self):
+        """Return the read-only connection, opening it on first use."""
+        if self._conn is None:
+            # isolation_level=None: a finished scan holds no read transaction,
+            # so the next one sees rows committed in between.
+            self._conn = connect_read_only(
+                self.db_name,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+        return self._conn
+
+    def close(self) -> None:
+        """Close the read-only connection; a later scan reopens it."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @property
+    def validation_results(self) -> List[ValidationResult]:
+        return self._validation_results
+
+    @validation_results.setter
+    def validation_results(self, results: List[ValidationResult]) -> None:
+        # Assigning new results drops the get_issues_by_* buckets
+        self._validation_results = results
+        self._buckets = None
+
+    def _issue_buckets(self):
+        """(by_severity, by_type) lists of validation_results, built on first use."""
+        if self._buckets is None:
+            by_severity = defaultdict(list)
+            by_type = defaultdict(list)
+            for r in self._validation_results:
+                by_severity[r.severity].append(r)
+                by_type[r.type].append(r)
+            self._buckets = (by_severity, by_type)
+        return self._buckets
     
     def _build_default_validator_chain(self) -> BaseValidator:
         """
@@ -28,12 +84,36 @@ class ValidationService:
         cta = PurchaseCTAValidator()
         price_mismatch = PriceMismatchValidator()
 
-        # CTA check runs first — if a course is completely unreachable,
-        # we still want price mismatch checked independently.
+        # CTA check runs first — if a course is completely unreachable
+        # (CRITICAL), its terminal_severities skip the price mismatch check.
         cta.set_next(price_mismatch)
 
         return cta
     
+    @property
+    def sql_prefilter(self) -> Optional[str]:
+        """WHERE clause from the current chain's sql_candidates (None = read every row).
+
+        Rebuilt on every access, so a reassigned or extended validator_chain
+        is always honoured.
+        """
+        return self._chain_sql_prefilter(self.validator_chain)
+
+    @staticmethod
+    def _chain_sql_prefilter(chain: BaseValidator) -> Optional[str]:
+        """
+        OR together every validator's sql_candidates so SQLite drops rows no
+        validator could flag. Returns None if any validator has no predicate.
+        """
+        predicates = []
+        validator = chain
+        while validator is not None:
+            if validator.sql_candidates is None:
+                return None
+            predicates.append(f"({validator.sql_candidates})")
+            validator = validator.next_validator
+        return " OR ".join(predicates) or None
+
     def validate_course(self, course_data: Dict[str, Any]) -> List[ValidationResult]:
         """Validate a single course record and return all check results."""
         return self.validator_chain.validate(course_data)
@@ -49,28 +129,48 @@ class ValidationService:
         Returns:
             List of all ValidationResult objects found.
         """
-        all_issues = []
+        all_issues = list(self.validate_all_courses_iter(run_id))
+        self.validation_results = all_issues
+        return all_issues
 
-        with sqlite3.connect(self.db_name) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+    def validate_all_courses_iter(self, run_id: Optional[int] = None) -> Iterator[ValidationResult]:
+        """
+        Yield ValidationResult objects as course rows are read.
 
+        Rows are fetched FETCH_SIZE at a time, so memory stays bounded by one
+        chunk and the first issues arrive before the whole table is read.
+        Unlike validate_all_courses, results are not stored on the instance.
+        """
+        with closing(self._connection().cursor()) as cursor:
+            cursor.arraysize = self.FETCH_SIZE
+
+            conditions, params = [], ()
             if run_id is not None:
-                cursor.execute("SELECT * FROM courses WHERE run_id = ?", (run_id,))
-            else:
-                cursor.execute("SELECT * FROM courses")
-
-            for row in cursor.fetchall():
-                course_data = dict(row)
-                issues = self.validate_course(course_data)
-                viewport = course_data.get('viewport', 'desktop')
-                for issue in issues:
-                    issue.viewport = viewport
-                all_issues.extend(issues)
-        
-        self.validation_results = all_issues
-        return all_issues
-    
+                conditions.append("run_id = ?")
+                params = (run_id,)
+            prefilter = self.sql_prefilter
+            if prefilter:
+                conditions.append(f"({prefilter})")
+            sql = _SELECT_COURSES
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            # Explicit order: the WHERE clause can make SQLite walk
+            # idx_courses_report, which would reorder issues by viewport.
+            sql += " ORDER BY id"
+            cursor.execute(sql, params)
+
+            # Resolved once: the chain and column names are fixed for the scan,
+            # so each row costs one dict build and one chain call.
+            validate = self.validator_chain.validate
+            columns = _COURSE_COLUMNS
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for row in rows:
+                    # The chain stamps viewport/base_url on every issue itself.
+                    yield from validate(dict(zip(columns, row)))
+
     def get_summary(self) -> Dict[str, Any]:
         """
         Get a summary of validation results.
@@ -78,35 +178,25 @@ class ValidationService:
         Returns:
             Dictionary with counts by type and severity
         """
-        if not self.validation_results:
-            return {
-                'total_issues': 0,
-                'by_type': {},
-                'by_severity': {}
-            }
-        
-        summary = {
+        by_type: Counter = Counter()
+        by_severity: Counter = Counter()
+        for result in self.validation_results:
+            by_type[result.type] += 1
+            by_severity[result.severity] += 1
+
+        return {
             'total_issues': len(self.validation_results),
-            'by_type': {},
-            'by_severity': {}
+            'by_type': dict(by_type),
+            'by_severity': dict(by_severity),
         }
-        
-        for result in self.validation_results:
-            # Count by type
-            summary['by_type'][result.type] = summary['by_type'].get(result.type, 0) + 1
-            
-            # Count by severity
-            summary['by_severity'][result.severity] = summary['by_severity'].get(result.severity, 0) + 1
-        
-        return summary
     
     def get_issues_by_severity(self, severity: str) -> List[ValidationResult]:
         """Get all issues of a specific severity level."""
-        return [r for r in self.validation_results if r.severity == severity]
+        return list(self._issue_buckets()[0].get(severity, ()))
     
     def get_issues_by_type(self, issue_type: str) -> List[ValidationResult]:
         """Get all issues of a specific type."""
-        return [r for r in self.validation_results if r.type == issue_type]
+        return list(self._issue_buckets()[1].get(issue_type, ()))
     
     def log_results(self):
         """Log validation results to the console."""
@@ -141,14 +231,14 @@ class ValidationService:
 
         # By Severity
         logging.info("Issues by Severity:")
-        for severity in ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']:
+        for severity in SEVERITY_ORDER:
             count = summary['by_severity'].get(severity, 0)
             if count > 0:
                 logging.warning(f"  {severity}: {count}")
         logging.info("")
 
         # Detailed Issues (Critical and High only, deduplicated)
-        critical_and_high = [r for r in unique_results if r.severity in ['CRITICAL', 'HIGH']]
+        critical_and_high = [r for r in unique_results if r.severity in (SEV_CRITICAL, SEV_HIGH)]
         if critical_and_high:
             logging.info(f"Critical & High Severity Issues ({len(critical_and_high)} unique):")
             for result in critical_and_high:
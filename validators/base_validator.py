@@ -1,16 +1,23 @@
 """
 Base Validator
-Abstract base class for all validation rules.
+Base class for all validation rules.
 """
 
-from abc import ABC, abstractmethod
-from typing import Dict, List, Any
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, FrozenSet
+from dataclasses import dataclass, field as dc_field
 
 
-@dataclass
+# Escapes Markdown table-cell separators in free-text fields.
+_MD_PIPE = str.maketrans({'|': '\\|'})
+
+
+@dataclass(slots=True)
 class ValidationResult:
-    """Represents the result of a validation check."""
+    """Represents the result of a validation check.
+
+    slots=True: a large run creates one of these per issue, so they carry
+    no per-instance __dict__.
+    """
     type: str  # e.g., 'BROKEN_LINK', 'PRICE_MISMATCH'
     severity: str  # 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'
     message: str
@@ -20,14 +27,30 @@ class ValidationResult:
     actual: Any = None
     viewport: str = 'desktop'  # 'desktop' | 'mobile'
     base_url: str = 'Unknown'
+    # Markdown-safe renderings of expected/actual, escaped once on creation
+    md_expected: str = dc_field(init=False, repr=False, compare=False)
+    md_actual: str = dc_field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.md_expected = str(self.expected or '—').translate(_MD_PIPE)
+        self.md_actual = str(self.actual or '—').translate(_MD_PIPE)
 
 
-class BaseValidator(ABC):
+class BaseValidator:
     """
-    Abstract base class for validators using Chain of Responsibility pattern.
+    Base class for validators using Chain of Responsibility pattern.
     Each validator can be chained to the next validator.
     """
     
+    # SQL predicate over the courses table that every row this validator
+    # could flag satisfies (a superset is fine). None means "any row", which
+    # disables SQL pre-filtering for the whole chain.
+    sql_candidates: Optional[str] = None
+
+    # Severities that end the chain: once this validator reports one, the
+    # validators after it are skipped for that row. Empty = always continue.
+    terminal_severities: FrozenSet[str] = frozenset()
+
     def __init__(self):
         self.next_validator = None
     
@@ -50,24 +73,30 @@ class BaseValidator(ABC):
         Returns:
             List of ValidationResult objects
         """
-        issues = self._validate(course_data)
-        
+        # Walk the chain in one loop rather than recursing through
+        # next_validator, so every validator appends to the same list.
+        issues = []
+        validator = self
+        while validator is not None:
+            found = validator._validate(course_data)
+            issues.extend(found)
+            terminal = validator.terminal_severities
+            if terminal and any(issue.severity in terminal for issue in found):
+                break
+            validator = validator.next_validator
+
         # Auto-inject viewport and base_url into all issues.
         # course_data is the authoritative source — always overwrite the
         # dataclass defaults so the correct viewport is stamped on every result.
-        viewport = course_data.get('viewport', 'desktop')
-        base_url = course_data.get('base_url', 'Unknown')
-        for issue in issues:
-            issue.viewport = viewport
-            issue.base_url = base_url
-            
-        # Chain to next validator
-        if self.next_validator:
-            issues.extend(self.next_validator.validate(course_data))
+        if issues:
+            viewport = course_data.get('viewport', 'desktop')
+            base_url = course_data.get('base_url', 'Unknown')
+            for issue in issues:
+                issue.viewport = viewport
+                issue.base_url = base_url
         
         return issues
     
-    @abstractmethod
     def _validate(self, course_data: Dict[str, Any]) -> List[ValidationResult]:
         """
         Implement the actual validation logic.
@@ -79,4 +108,4 @@ class BaseValidator(ABC):
         Returns:
             List of ValidationResult objects for issues found
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement _validate")
@@ -4,8 +4,13 @@ Validates that prices on course cards match the prices on PDPs.
 """
 
 from typing import Dict, List, Any
+from constants import SEV_MEDIUM, TYPE_PRICE_MISMATCH
 from .base_validator import BaseValidator, ValidationResult
-from utils import is_price_missing as _is_price_missing, clean_price as _clean_price
+from utils import (
+    is_price_missing as _is_price_missing,
+    clean_price as _clean_price,
+    price_value as _price_value,
+)
 
 
 class PriceMismatchValidator(BaseValidator):
@@ -17,32 +22,40 @@ class PriceMismatchValidator(BaseValidator):
     2. Card has a price but PDP doesn't (or vice versa)
     """
 
+    # Rows SQLite can already rule out: identical strings, a missing-price
+    # sentinel on either side, or prices that only differ by separators.
+    sql_candidates = (
+        "price IS NOT NULL AND pdp_price IS NOT NULL AND price <> pdp_price"
+        " AND LOWER(TRIM(price)) NOT IN ('', 'n/a', 'not found', 'error')"
+        " AND LOWER(TRIM(pdp_price)) NOT IN ('', 'n/a', 'not found', 'error')"
+        " AND REPLACE(REPLACE(REPLACE(price, ',', ''), ' ', ''), '₹', '')"
+        " <> REPLACE(REPLACE(REPLACE(pdp_price, ',', ''), ' ', ''), '₹', '')"
+    )
+
     def _validate(self, course_data: Dict[str, Any]) -> List[ValidationResult]:
-        issues = []
-
-        course_name = course_data.get('course_name', 'Unknown Course')
-        card_price  = course_data.get('price', '')
-        pdp_price   = course_data.get('pdp_price', '')
-
-        # Both prices must be present for a mismatch to be meaningful.
-        if _is_price_missing(card_price) or _is_price_missing(pdp_price):
-            return issues
-
-        clean_card = _clean_price(card_price)
-        clean_pdp  = _clean_price(pdp_price)
-
-        if clean_card and clean_pdp and clean_card != clean_pdp:
-            issues.append(ValidationResult(
-                type='PRICE_MISMATCH',
-                severity='MEDIUM',
-                message=f"Price on card ({card_price}) doesn't match price on PDP ({pdp_price})",
-                course_name=course_name,
-                field='price',
-                expected=card_price,
-                actual=pdp_price,
-            ))
-
-        return issues
+        get = course_data.get
+        card_price = get('price', '')
+        pdp_price  = get('pdp_price', '')
+
+        # price_value is None for a missing price, and both prices must be
+        # present for a mismatch to be meaningful. Comparing as integers
+        # means "093500" and "93500" count as equal.
+        card_value = _price_value(card_price)
+        if card_value is None:
+            return []
+        pdp_value = _price_value(pdp_price)
+        if pdp_value is None or card_value == pdp_value:
+            return []
+
+        return [ValidationResult(
+            type=TYPE_PRICE_MISMATCH,
+            severity=SEV_MEDIUM,
+            message=f"Price on card ({card_price}) doesn't match price on PDP ({pdp_price})",
+            course_name=get('course_name', 'Unknown Course'),
+            field='price',
+            expected=card_price,
+            actual=pdp_price,
+        )]
 
     # ------------------------------------------------------------------
     # Public wrappers kept for backwards-compatibility with existing tests
@@ -8,6 +8,7 @@ Both checks represent the same business failure: a user cannot purchase the cour
 """
 
 from typing import Dict, List, Any
+from constants import SEV_CRITICAL, SEV_HIGH, TYPE_CTA_BROKEN, TYPE_CTA_MISSING
 from .base_validator import BaseValidator, ValidationResult
 
 
@@ -20,20 +21,31 @@ class PurchaseCTAValidator(BaseValidator):
     - The PDP was reached but has no purchase button             (HIGH)
     """
 
+    sql_candidates = (
+        "cta_link IS NULL OR cta_link IN ('', 'N/A', 'Error') OR is_broken = 1"
+        " OR (base_url <> '' AND RTRIM(cta_link, '/') = RTRIM(base_url, '/'))"
+        " OR cta_status = 'Not Found'"
+    )
+
+    # A CRITICAL issue means the PDP is unreachable, so there is no PDP
+    # price worth comparing: skip the rest of the chain for that row.
+    terminal_severities = frozenset({SEV_CRITICAL})
+
     def _validate(self, course_data: Dict[str, Any]) -> List[ValidationResult]:
         issues = []
 
-        course_name = course_data.get('course_name', 'Unknown Course')
-        base_url    = course_data.get('base_url', '')
-        cta_link    = course_data.get('cta_link', '')
-        is_broken   = course_data.get('is_broken', 0)
-        cta_status  = course_data.get('cta_status', 'N/A')
+        get = course_data.get
+        course_name = get('course_name', 'Unknown Course')
+        base_url    = get('base_url', '')
+        cta_link    = get('cta_link', '')
+        is_broken   = get('is_broken', 0)
+        cta_status  = get('cta_status', 'N/A')
 
         # --- Check 1: CTA link missing or invalid ---
         if not cta_link or cta_link in ['N/A', 'Error', '']:
             issues.append(ValidationResult(
-                type='CTA_BROKEN',
-                severity='CRITICAL',
+                type=TYPE_CTA_BROKEN,
+                severity=SEV_CRITICAL,
                 message="No CTA link found on course card",
                 course_name=course_name,
                 field='cta_link',
@@ -43,14 +55,15 @@ class PurchaseCTAValidator(BaseValidator):
             return issues  # No point checking further
 
         # --- Check 2: Link doesn't navigate away from the listing ---
+        # Both are absolute URLs, so only a trailing slash can differ.
         link_is_same_page = (
             is_broken == 1 or
-            (base_url and cta_link.strip('/') == base_url.strip('/'))
+            (base_url and cta_link.rstrip('/') == base_url.rstrip('/'))
         )
         if link_is_same_page:
             issues.append(ValidationResult(
-                type='CTA_BROKEN',
-                severity='CRITICAL',
+                type=TYPE_CTA_BROKEN,
+                severity=SEV_CRITICAL,
                 message="Course card link doesn't navigate to a PDP",
                 course_name=course_name,
                 field='cta_link',
@@ -62,8 +75,8 @@ class PurchaseCTAValidator(BaseValidator):
         # --- Check 3: PDP reached but no purchase button ---
         if cta_status == 'Not Found':
             issues.append(ValidationResult(
-                type='CTA_MISSING',
-                severity='HIGH',
+                type=TYPE_CTA_MISSING,
+                severity=SEV_HIGH,
                 message="PDP reachable but no Enroll/Buy Now button found",
                 course_name=course_name,
                 field='cta_status',